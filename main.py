@@ -2,25 +2,40 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import asyncio
-import subprocess
-import json
+import bisect
+import functools
+from collections import Counter, OrderedDict, defaultdict
+import heapq
+import orjson
 from datetime import datetime
-import shlex
 import logging
 import shutil
 import os
+import re
+import secrets
+import shlex
+import signal
 from typing import Optional, List, Dict, Any
+from dataclasses import dataclass, field
 import threading
 import time
+from urllib.parse import quote
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 # Load environment variables
 DISCORD_TOKEN = os.getenv('DISCORD_TOKEN')
 MAIN_ADMIN_ID = int(os.getenv('MAIN_ADMIN_ID', '1347534067788156998'))
+MAIN_ADMIN_STR = str(MAIN_ADMIN_ID)
 VPS_USER_ROLE_ID = int(os.getenv('VPS_USER_ROLE_ID', '1469390397276029000'))
 DEFAULT_STORAGE_POOL = os.getenv('DEFAULT_STORAGE_POOL', 'default')
 CPU_THRESHOLD = int(os.getenv('CPU_THRESHOLD', '90'))
 RAM_THRESHOLD = int(os.getenv('RAM_THRESHOLD', '90'))
 CHECK_INTERVAL = int(os.getenv('CHECK_INTERVAL', '600'))  # 10 minutes for VPS monitoring
+MONITOR_CONCURRENCY = 32  # Max VPS sampled at once by the monitor
 
 # Configure logging to file and console
 logging.basicConfig(
@@ -58,28 +73,53 @@ bot = commands.Bot(command_prefix='!', intents=intents, help_command=None)
 cpu_monitor_active = True
 
 # Helper function to truncate text to a specific length
+@functools.lru_cache(maxsize=1024)
+def truncate_cached(text, max_length):
+    """Cut an over-long string to max_length characters, memoized for repeat strings"""
+    return text[:max_length-3] + "..."
+
 def truncate_text(text, max_length=1024):
     """Truncate text to max_length characters"""
     if not text:
         return text
+    if not isinstance(text, str):
+        text = str(text)
+    # Short strings are returned as-is; the length check is cheaper than a cache lookup
     if len(text) <= max_length:
         return text
-    return text[:max_length-3] + "..."
+    return truncate_cached(text, max_length)
+
+# Helper function to split a list into fixed-size chunks (itertools.batched needs Python 3.12)
+def chunked(items, size):
+    """Yield consecutive slices of at most size items"""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+# Footer timestamp, reformatted at most once per second
+footer_time_cache = [0, ""]
+
+def footer_timestamp():
+    """Current local time as '%Y-%m-%d %H:%M:%S', cached for the current second"""
+    now = int(time.time())
+    if now != footer_time_cache[0]:
+        footer_time_cache[:] = [now, time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now))]
+    return footer_time_cache[1]
 
 # Embed creation functions with black theme and RathamCloud branding
+EMBED_LOGO_URL = "https://github.com/MrPk9727/logo/blob/main/logo-bg.png?raw=true"
+
 def create_embed(title, description="", color=0x1a1a1a):
     """Create a dark-themed embed with proper field length handling and RathamCloud branding"""
-    embed = discord.Embed(
-        title=truncate_text(f"🌟 RathamCloud - {title}", 256),
-        description=truncate_text(description, 4096),
-        color=color
-    )
-
-    embed.set_thumbnail(url="https://github.com/MrPk9727/logo/blob/main/logo-bg.png?raw=true")
-    embed.set_footer(text=f"RathamCloud VPS Manager • {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-                    icon_url="https://github.com/MrPk9727/logo/blob/main/logo-bg.png?raw=true")
-
-    return embed
+    # Built from the raw embed dict, skipping Embed.__init__ and the set_thumbnail/set_footer calls;
+    # the nested dicts are fresh each time so embeds never share mutable state
+    return discord.Embed.from_dict({
+        "type": "rich",
+        "title": truncate_text(f"🌟 RathamCloud - {title}", 256),
+        "description": truncate_text(description, 4096),
+        "color": color,
+        "thumbnail": {"url": EMBED_LOGO_URL},
+        "footer": {"text": f"RathamCloud VPS Manager • {footer_timestamp()}", "icon_url": EMBED_LOGO_URL},
+    })
 
 def add_field(embed, name, value, inline=False):
     """Add a field to an embed with proper truncation"""
@@ -90,6 +130,19 @@ def add_field(embed, name, value, inline=False):
     )
     return embed
 
+def add_fields(embed, fields):
+    """Add several (name, value, inline) fields to an embed in one go, truncated like add_field"""
+    # Same field dicts discord.Embed.add_field builds, appended in a single extend
+    new_fields = [
+        {'inline': inline, 'name': truncate_text(f"▸ {name}", 256), 'value': truncate_text(value, 1024)}
+        for name, value, inline in fields
+    ]
+    try:
+        embed._fields.extend(new_fields)
+    except AttributeError:
+        embed._fields = new_fields
+    return embed
+
 def create_success_embed(title, description=""):
     return create_embed(title, description, color=0x00ff88)
 
@@ -102,64 +155,367 @@ def create_info_embed(title, description=""):
 def create_warning_embed(title, description=""):
     return create_embed(title, description, color=0xffaa00)
 
+# Discord's per-message limits on embed count and combined embed text
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+
+async def send_embeds(destination, embeds):
+    """Send embeds in order, packing as many into each message as Discord allows"""
+    batch, batch_chars = [], 0
+    for embed in embeds:
+        chars = len(embed)
+        if batch and (len(batch) == MAX_EMBEDS_PER_MESSAGE or batch_chars + chars > MAX_EMBED_CHARS_PER_MESSAGE):
+            await destination.send(embeds=batch)
+            batch, batch_chars = [], 0
+        batch.append(embed)
+        batch_chars += chars
+    if batch:
+        await destination.send(embeds=batch)
+
 # Data storage functions
+# Fields every VPS record carries; older records are filled in at load so hot paths can index directly
+VPS_DEFAULTS = {
+    "status": "unknown",
+    "suspended": False,
+    "config": "Custom",
+    "suspension_history": list,
+    "shared_with": set,
+}
+
+def parse_gb(text):
+    """Parse a size string like '4GB' or '4 GB' into an int number of GB"""
+    return int(str(text).upper().replace("GB", "").strip())
+
+def normalize_vps(vps):
+    """Fill in missing VPS fields with their defaults"""
+    for key, default in VPS_DEFAULTS.items():
+        if key not in vps:
+            vps[key] = default() if callable(default) else default
+    # Shared user IDs are kept as a set in memory and stored as a sorted list
+    if not isinstance(vps["shared_with"], set):
+        vps["shared_with"] = set(vps["shared_with"])
+    # Numeric sizes were added later; derive them from the display strings for older records
+    for key, source in (("ram_gb", "ram"), ("disk_gb", "storage")):
+        if key not in vps and source in vps:
+            try:
+                vps[key] = parse_gb(vps[source])
+            except ValueError:
+                logger.warning(f"Could not parse {source} '{vps[source]}' of {vps.get('container_name')}")
+    # Core counts used to be stored as strings
+    if isinstance(vps.get("cpu"), str):
+        try:
+            vps["cpu"] = int(vps["cpu"])
+        except ValueError:
+            logger.warning(f"Could not parse cpu '{vps['cpu']}' of {vps.get('container_name')}")
+    return vps
+
 def load_vps_data():
     try:
-        with open('vps_data.json', 'r') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
+        with open('vps_data.json', 'rb') as f:
+            data = orjson.loads(f.read())
+        for vps_list in data.values():
+            for vps in vps_list:
+                normalize_vps(vps)
+        return data
+    except (FileNotFoundError, orjson.JSONDecodeError):
         logger.warning("vps_data.json not found or corrupted, initializing empty data")
         return {}
 
 def load_admin_data():
     try:
-        with open('admin_data.json', 'r') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
+        with open('admin_data.json', 'rb') as f:
+            data = orjson.loads(f.read())
+    except (FileNotFoundError, orjson.JSONDecodeError):
         logger.warning("admin_data.json not found or corrupted, initializing with main admin")
-        return {"admins": [str(MAIN_ADMIN_ID)]}
+        data = {"admins": [MAIN_ADMIN_STR]}
+    # Admin IDs are kept as a set in memory and stored as a sorted list
+    data["admins"] = set(data.get("admins", []))
+    return data
 
 def load_port_data():
     try:
-        with open('port_data.json', 'r') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
+        with open('port_data.json', 'rb') as f:
+            data = orjson.loads(f.read())
+    except (FileNotFoundError, orjson.JSONDecodeError):
         logger.warning("port_data.json not found or corrupted, initializing empty data")
-        return {"users": {}, "active_ports": {}}
+        data = {"users": {}, "active_ports": {}}
+    # Each user's forwards are kept as {host_port: forward} in memory and stored as a list
+    data["active_ports"] = {
+        user_id: {p["host_port"]: p for p in forwards}
+        for user_id, forwards in data.get("active_ports", {}).items()
+    }
+    return data
 
 # Load all data at startup
 vps_data = load_vps_data()
 admin_data = load_admin_data()
 port_data = load_port_data()
 
+# IDs allowed to run admin commands (main admin included), kept in sync by admin-add/admin-remove
+admin_ids = admin_data["admins"] | {MAIN_ADMIN_STR}
+
+# Every VPS by container name: {container_name: (user_id, vps)}, kept in sync on create/delete
+container_index = {vps['container_name']: (uid, vps) for uid, vps_list in vps_data.items() for vps in vps_list}
+
+# Sorted (lowercase name, name) pairs of every VPS container, for autocomplete
+container_names = sorted((name.lower(), name) for name in container_index)
+
+def name_trigrams(lower):
+    return {lower[i:i + 3] for i in range(len(lower) - 2)}
+
+# Substring index for autocomplete: {trigram of a lowercase name: {(lowercase name, name)}}
+# Every name shares the "rathamcloud-vps-" prefix, so typed user IDs/numbers rarely hit the prefix search
+container_trigrams = defaultdict(set)
+for entry in container_names:
+    for gram in name_trigrams(entry[0]):
+        container_trigrams[gram].add(entry)
+
+def vps_state(vps):
+    """Overview bucket of a VPS: 'suspended' takes precedence, then 'running' or 'stopped'"""
+    if vps['suspended']:
+        return 'suspended'
+    if vps['status'] == 'running':
+        return 'running'
+    return 'stopped'
+
+@dataclass
+class ResourceTotals:
+    """Allocated RAM, CPU and disk, and vps_state counts, summed over a group of VPS"""
+    ram_gb: int = 0
+    cpu: int = 0
+    disk_gb: int = 0
+    states: Counter = field(default_factory=Counter)
+
+    def add(self, vps, sign=1):
+        self.ram_gb += sign * vps.get('ram_gb', 0)
+        self.cpu += sign * vps.get('cpu', 0)
+        self.disk_gb += sign * vps.get('disk_gb', 0)
+        self.states[vps_state(vps)] += sign
+
+    def remove(self, vps):
+        self.add(vps, -1)
+
+    @property
+    def vps_count(self):
+        return sum(self.states.values())
+
+# Running totals over every indexed VPS and per owner ({user_id: ResourceTotals}), updated on create/delete/resize/state change
+resource_totals = ResourceTotals()
+user_totals = defaultdict(ResourceTotals)
+for uid, vps in container_index.values():
+    resource_totals.add(vps)
+    user_totals[uid].add(vps)
+
+def indexed_totals(vps):
+    """The totals a VPS counts towards, or () if it is not (or no longer) indexed"""
+    entry = container_index.get(vps['container_name'])
+    if entry is None or entry[1] is not vps:
+        return ()
+    return (resource_totals, user_totals[entry[0]])
+
+def set_vps_state(vps, status=None, suspended=None):
+    """Update a VPS status and/or suspended flag, keeping the state counts in sync"""
+    totals = indexed_totals(vps)
+    for t in totals:
+        t.states[vps_state(vps)] -= 1
+    if status is not None:
+        vps['status'] = status
+    if suspended is not None:
+        vps['suspended'] = suspended
+    for t in totals:
+        t.states[vps_state(vps)] += 1
+
+def set_vps_resources(vps, ram_gb, cpu, disk_gb):
+    """Update a VPS's allocated sizes and display strings, keeping the totals in sync"""
+    totals = indexed_totals(vps)
+    for t in totals:
+        t.remove(vps)
+    vps['ram'] = f"{ram_gb}GB"
+    vps['cpu'] = cpu
+    vps['storage'] = f"{disk_gb}GB"
+    vps['ram_gb'] = ram_gb
+    vps['disk_gb'] = disk_gb
+    for t in totals:
+        t.add(vps)
+
+def index_vps(user_id, vps):
+    """Register a newly added VPS in the lookup indexes"""
+    name = vps['container_name']
+    container_index[name] = (user_id, vps)
+    entry = (name.lower(), name)
+    bisect.insort(container_names, entry)
+    for gram in name_trigrams(entry[0]):
+        container_trigrams[gram].add(entry)
+    for t in indexed_totals(vps):
+        t.add(vps)
+
+def unindex_vps(container_name):
+    """Drop a removed VPS from the lookup indexes"""
+    entry = container_index.pop(container_name, None)
+    if entry:
+        user_id, vps = entry
+        resource_totals.remove(vps)
+        user_totals[user_id].remove(vps)
+        if not user_totals[user_id].vps_count:
+            del user_totals[user_id]
+    vps_embed_fragments.pop(container_name, None)
+    tmate_ready.discard(container_name)
+    # Per-container locks and samples would otherwise outlive the VPS
+    container_action_locks.pop(container_name, None)
+    container_stats_locks.pop(container_name, None)
+    container_cpu_samples.pop(container_name, None)
+    entry = (container_name.lower(), container_name)
+    i = bisect.bisect_left(container_names, entry)
+    if i < len(container_names) and container_names[i] == entry:
+        del container_names[i]
+    for gram in name_trigrams(entry[0]):
+        names = container_trigrams.get(gram)
+        if names is not None:
+            names.discard(entry)
+            if not names:
+                del container_trigrams[gram]
+
+def search_container_names(current, limit=25):
+    """Container names containing current (case-insensitive), prefix matches first"""
+    key = current.lower()
+    lo = bisect.bisect_left(container_names, (key,))
+    hi = bisect.bisect_left(container_names, (key + '\uffff',))
+    matches = [name for _, name in container_names[lo:min(hi, lo + limit)]]
+    if len(matches) >= limit or not key:
+        return matches
+    # Fill up with matches further inside the name (e.g. a user ID)
+    if len(key) < 3:
+        # Too short for a trigram; one or two characters match most names, so the scan stops early
+        candidates = (entry for entry in container_names if key in entry[0] and not entry[0].startswith(key))
+    else:
+        # Only names holding every trigram of key can contain it; start from the rarest trigram
+        sets = sorted((container_trigrams.get(gram, set()) for gram in name_trigrams(key)), key=len)
+        found = sets[0].intersection(*sets[1:])
+        candidates = heapq.nsmallest(limit - len(matches), (entry for entry in found if key in entry[0] and not entry[0].startswith(key)))
+    for _, name in candidates:
+        matches.append(name)
+        if len(matches) >= limit:
+            break
+    return matches
+
 # Save data function
-def save_data():
+# Snapshots are numbered so a slow background write can never overwrite a newer one
+data_write_lock = threading.Lock()
+data_snapshot_seq = 0
+data_written_seq = 0
+# Bytes last written per file, so unchanged files are not rewritten
+data_written_payloads = {}
+
+def json_default(obj):
+    """orjson fallback for types it does not serialize natively"""
+    if isinstance(obj, set):
+        # Sorted so unchanged data always encodes to the same bytes
+        return sorted(obj)
+    raise TypeError
+
+def port_data_for_disk():
+    """port_data with each user's forwards back in their stored list form"""
+    return {**port_data, "active_ports": {user_id: list(forwards.values()) for user_id, forwards in port_data["active_ports"].items()}}
+
+def encode_data():
+    """Serialize all data dicts to JSON bytes on the calling (event loop) thread"""
+    global data_snapshot_seq
+    data_snapshot_seq += 1
+    return data_snapshot_seq, [
+        ('vps_data.json', orjson.dumps(vps_data, default=json_default, option=orjson.OPT_INDENT_2)),
+        ('admin_data.json', orjson.dumps(admin_data, default=json_default, option=orjson.OPT_INDENT_2)),
+        ('port_data.json', orjson.dumps(port_data_for_disk(), option=orjson.OPT_INDENT_2)),
+    ]
+
+def write_file_atomic(path, payload, durable=False):
+    """Write bytes to a temp file and atomically replace path, fsyncing first if durable"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(payload)
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+def write_data_files(snapshot, durable=False):
+    """Write an encoded snapshot to disk unless a newer one was already written"""
+    global data_written_seq
+    seq, payloads = snapshot
+    with data_write_lock:
+        if seq < data_written_seq:
+            return
+        changed = [(path, payload) for path, payload in payloads if data_written_payloads.get(path) != payload]
+        for path, payload in changed:
+            write_file_atomic(path, payload, durable)
+            data_written_payloads[path] = payload
+        if durable and changed:
+            # Persist the renames themselves
+            dir_fd = os.open('.', os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        data_written_seq = seq
+
+def save_data(durable=False):
     try:
-        # Atomic save for vps_data
-        temp_vps = 'vps_data.json.tmp'
-        with open(temp_vps, 'w') as f:
-            json.dump(vps_data, f, indent=4)
-        os.replace(temp_vps, 'vps_data.json')
-        
-        temp_admin = 'admin_data.json.tmp'
-        with open(temp_admin, 'w') as f:
-            json.dump(admin_data, f, indent=4)
-        os.replace(temp_admin, 'admin_data.json')
-        
-        temp_port = 'port_data.json.tmp'
-        with open(temp_port, 'w') as f:
-            json.dump(port_data, f, indent=4)
-        os.replace(temp_port, 'port_data.json')
-        
+        write_data_files(encode_data(), durable)
+        logger.info("Data saved successfully")
+    except Exception as e:
+        logger.error(f"Error saving data: {e}")
+
+async def save_data_async():
+    """Save data with the file writes offloaded to a worker thread"""
+    try:
+        snapshot = encode_data()
+        # Writes are batched by the flusher, so the fsync cost is paid once per batch
+        await asyncio.to_thread(write_data_files, snapshot, True)
         logger.info("Data saved successfully")
     except Exception as e:
         logger.error(f"Error saving data: {e}")
 
+# Debounced saving: mutations mark the data dirty and a background task writes it
+SAVE_DEBOUNCE_SECONDS = 0.5
+SAVE_MAX_DELAY_SECONDS = 2.0
+save_pending = asyncio.Event()
+dirty_count = 0
+data_flusher_task = None
+monitor_task = None
+
+def mark_dirty():
+    """Schedule a save of all data files on the next flush"""
+    global dirty_count
+    dirty_count += 1
+    save_pending.set()
+
+async def data_flusher():
+    """Write pending data changes at most once per debounce window"""
+    loop = asyncio.get_running_loop()
+    last_flush = float('-inf')
+    while True:
+        await save_pending.wait()
+        started = loop.time()
+        # After an idle spell the change is written right away; only changes following a recent write wait
+        if started - last_flush < SAVE_DEBOUNCE_SECONDS:
+            seen = dirty_count
+            # Let the rest of a burst of changes land before writing them all at once
+            await asyncio.sleep(SAVE_DEBOUNCE_SECONDS)
+            # Keep extending the window while changes are still arriving, up to the max delay
+            while dirty_count != seen and loop.time() - started < SAVE_MAX_DELAY_SECONDS:
+                seen = dirty_count
+                await asyncio.sleep(SAVE_DEBOUNCE_SECONDS)
+        save_pending.clear()
+        await save_data_async()
+        last_flush = loop.time()
+
+def handle_sigterm(signum, frame):
+    """Turn SIGTERM (systemd stop) into a clean shutdown so pending data is flushed"""
+    raise KeyboardInterrupt
+
 # Admin checks - Updated to not send message in predicate, more specific errors
 def is_admin():
     async def predicate(ctx):
-        user_id = str(ctx.author.id)
-        if user_id == str(MAIN_ADMIN_ID) or user_id in admin_data.get("admins", []):
+        if str(ctx.author.id) in admin_ids:
             return True
         # Custom error handling moved to on_command_error for better UX
         raise commands.CheckFailure(f"You need admin permissions to use this command. Contact RathamCloud support.")
@@ -167,49 +523,331 @@ def is_admin():
 
 def is_main_admin():
     async def predicate(ctx):
-        if str(ctx.author.id) == str(MAIN_ADMIN_ID):
+        if str(ctx.author.id) == MAIN_ADMIN_STR:
             return True
         raise commands.CheckFailure("Only the main admin can use this command.")
     return commands.check(predicate)
 
+# RTC subcommands that change a container's running state; cached stats for it are dropped
+RTC_LIFECYCLE_COMMANDS = {"init", "start", "stop", "restart", "delete", "copy", "rename", "restore"}
+
+# RTC subcommands that only read state; any other command bumps rtc_generation when it finishes
+RTC_READ_COMMANDS = {"list", "info", "exec", "query"}
+rtc_generation = 0
+
+# Cap on RTC processes running at once, so bursts of commands queue instead of swamping the host
+RTC_CONCURRENCY = 8
+rtc_semaphore = asyncio.Semaphore(RTC_CONCURRENCY)
+
+# Calls that can run for minutes (image pulls, copies, stop --all, long execs) get their own slots,
+# so a few creates or setups never hold up status probes, listings and the monitor sweep
+RTC_DEFAULT_TIMEOUT = 120
+RTC_LONG_COMMANDS = {"init", "copy"}
+RTC_LONG_CONCURRENCY = 4
+rtc_long_semaphore = asyncio.Semaphore(RTC_LONG_CONCURRENCY)
+
+def rtc_limiter(argv, timeout):
+    """The semaphore an RTC call queues on: long-running calls are kept apart from short ones"""
+    if timeout > RTC_DEFAULT_TIMEOUT or "--all" in argv or (len(argv) > 1 and argv[1] in RTC_LONG_COMMANDS):
+        return rtc_long_semaphore
+    return rtc_semaphore
+
 # Clean RTC command execution
-async def execute_RTC(command, timeout=120):
-    """Execute RTC command with timeout and error handling"""
+async def run_RTC(argv, timeout=RTC_DEFAULT_TIMEOUT):
+    """Run an RTC command given as an argument list and return (returncode, stdout, stderr) without raising on failure"""
+    # Replace 'RTC' with the actual path if it's the first argument
+    if argv and argv[0] == "RTC":
+        argv = [RTC_EXECUTABLE, *argv[1:]]
+
+    # The timeout covers the command itself, not time spent waiting for a slot
     try:
-        cmd = shlex.split(command)
-        # Replace 'RTC' with the actual path if it's the first argument
-        if cmd and cmd[0] == "RTC":
-            cmd[0] = RTC_EXECUTABLE
-            
-        proc = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+        async with rtc_limiter(argv, timeout):
+            proc = await asyncio.create_subprocess_exec(
+                *argv,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                raise
+    finally:
+        if len(argv) > 1 and argv[1] not in RTC_READ_COMMANDS:
+            invalidate_rtc_listings()
+    return proc.returncode, stdout.decode().strip(), stderr.decode().strip()
+
+async def read_capped(stream, limit):
+    """Read a stream to EOF keeping only its first limit bytes; return (data, truncated)"""
+    data = bytearray()
+    truncated = False
+    while True:
+        chunk = await stream.read(65536)
+        if not chunk:
+            return bytes(data), truncated
+        room = limit - len(data)
+        if room > 0:
+            data += chunk[:room]
+        if len(chunk) > room:
+            truncated = True
+
+class RTCShellPool:
+    """Long-lived `RTC exec <container> -- sh` processes reused for short read-only commands"""
+
+    def __init__(self, size=8, idle_timeout=60):
+        self.size = size
+        self.idle_timeout = idle_timeout
+        # {container_name: [process, lock, last_used]}, least recently used first
+        self.shells = OrderedDict()
+        # Held while spawning, so concurrent first calls for a container share one shell
+        self.spawn_lock = asyncio.Lock()
+
+    def discard(self, container_name, entry=None):
+        """Kill and forget a container's shell; given entry, kill that shell and unpool it only if still pooled"""
+        pooled = self.shells.get(container_name)
+        if entry is None:
+            entry = pooled
+        if not entry:
+            return
+        if entry is pooled:
+            del self.shells[container_name]
+        proc = entry[0]
+        if proc.returncode is None:
+            proc.kill()
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # Final shutdown after the loop has stopped; the bot process exits right after
+            return
+        # Wait on the shell in the background so it is reaped instead of left as a zombie
+        spawn_background(proc.wait())
+
+    def evict_idle(self):
+        """Close shells that have not been used for idle_timeout seconds"""
+        cutoff = time.monotonic() - self.idle_timeout
+        # last_used is stamped when a command finishes, so a held lock means a long command is still running
+        for name in [name for name, entry in self.shells.items() if entry[2] < cutoff and not entry[1].locked()]:
+            self.discard(name)
+
+    def close_all(self):
+        for name in list(self.shells):
+            self.discard(name)
+
+    def pooled_shell(self, container_name):
+        """The container's live pooled shell, marked most recently used, or None"""
+        entry = self.shells.get(container_name)
+        if entry and entry[0].returncode is None:
+            self.shells.move_to_end(container_name)
+            return entry
+        return None
+
+    async def get_shell(self, container_name):
+        entry = self.pooled_shell(container_name)
+        if entry:
+            return entry, True
+        async with self.spawn_lock:
+            # Another caller may have spawned it while we waited
+            entry = self.pooled_shell(container_name)
+            if entry:
+                return entry, True
+            self.discard(container_name)
+            proc = await asyncio.create_subprocess_exec(
+                RTC_EXECUTABLE, "exec", container_name, "--", "sh",
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                limit=1024 * 1024
+            )
+            entry = [proc, asyncio.Lock(), time.monotonic()]
+            self.shells[container_name] = entry
+            # Trim least recently used shells, skipping any that are in the middle of a command
+            for name in [name for name, other in self.shells.items() if not other[1].locked() and other is not entry]:
+                if len(self.shells) <= self.size:
+                    break
+                self.discard(name)
+        return entry, False
+
+    async def run(self, container_name, argv, timeout=60, limit=None):
+        """Run argv in the container's shell and return (returncode, output); stderr is folded into output
+
+        With limit, only the first limit bytes of output are kept; the rest is read and dropped.
+        """
+        self.evict_idle()
+        # A reused shell may have died with its container since the last call; retry once on a fresh one
+        for _ in range(2):
+            entry, reused = await self.get_shell(container_name)
+            returncode, output = await self.run_in(container_name, entry, argv, timeout, limit)
+            if returncode is not None:
+                return returncode, output
+            if not reused:
+                break
+        return 1, output or "Shell exited unexpectedly"
+
+    async def run_in(self, container_name, entry, argv, timeout, limit=None):
+        """Send one framed command to a shell; the returncode is None if the shell exited before answering"""
+        proc, lock, _ = entry
+        async with lock:
+            # The exit code comes back on a line tagged with a random token, so command output cannot fake it
+            token = secrets.token_hex(8)
+            marker = f"<<{token} ".encode()
+            lines = []
+            kept = 0
+            try:
+                try:
+                    proc.stdin.write(f"{shlex.join(argv)} </dev/null 2>&1; printf '\\n<<{token} %d>>\\n' $?\n".encode())
+                    await proc.stdin.drain()
+                except (BrokenPipeError, ConnectionResetError):
+                    # The shell exited since it was last used; run() retries on a fresh one
+                    self.discard(container_name, entry)
+                    return None, ""
+                deadline = time.monotonic() + timeout
+                while True:
+                    line = await asyncio.wait_for(proc.stdout.readline(), max(0, deadline - time.monotonic()))
+                    if not line:
+                        # The shell exited: container stopped, or the exec itself failed
+                        self.discard(container_name, entry)
+                        returncode = None
+                        break
+                    if line.startswith(marker):
+                        returncode = int(line[len(marker):].strip().rstrip(b">"))
+                        break
+                    if limit is None:
+                        lines.append(line)
+                    elif kept < limit:
+                        # The shell must still be drained up to the marker, but nothing past the cap is kept
+                        lines.append(line[:limit - kept])
+                        kept += len(line)
+            except BaseException:
+                # Timeout, broken pipe, an over-long line or cancellation can all leave a response
+                # half read; the next caller would get its output, so the shell cannot be reused
+                self.discard(container_name, entry)
+                raise
+            entry[2] = time.monotonic()
+        return returncode, b"".join(lines).decode(errors="replace").strip()
+
+rtc_shell_pool = RTCShellPool()
+
+# Bytes of diagnostic output kept for an embed field; a little over the 1000 characters shown
+DIAGNOSTIC_OUTPUT_CAP = 1500
+
+# Recent listing output: {argv: (rtc_generation, expires_at, (returncode, stdout, stderr))}
+RTC_LIST_TTL = 3
+rtc_list_cache = {}
+
+def invalidate_rtc_listings():
+    """Mark every cached listing as stale after a state-changing RTC command"""
+    global rtc_generation
+    rtc_generation += 1
+
+async def run_RTC_listing(argv):
+    """run_RTC for read-only listings, reusing a recent result if no RTC command has changed state since"""
+    key = tuple(argv)
+    now = time.monotonic()
+    cached = rtc_list_cache.get(key)
+    if cached and cached[0] == rtc_generation and cached[1] > now:
+        return cached[2]
+    # Taken before running, so a mutation that finishes meanwhile leaves this result stale
+    generation = rtc_generation
+    result = await run_RTC(argv)
+    if result[0] == 0:
+        rtc_list_cache[key] = (generation, now + RTC_LIST_TTL, result)
+    return result
+
+async def execute_RTC(argv, timeout=RTC_DEFAULT_TIMEOUT):
+    """Execute an RTC command given as an argument list, with timeout and error handling"""
+    command = " ".join(argv)
+    lifecycle = len(argv) > 2 and argv[1] in RTC_LIFECYCLE_COMMANDS
+    try:
+        returncode, stdout, stderr = await run_RTC(argv, timeout)
 
-        if proc.returncode != 0:
-            error = stderr.decode().strip() if stderr else "Command failed with no error output"
-            raise Exception(error)
+        if returncode != 0:
+            raise Exception(stderr or "Command failed with no error output")
 
-        return stdout.decode().strip() if stdout else True
+        return stdout or True
     except asyncio.TimeoutError:
         logger.error(f"RTC command timed out: {command}")
         raise Exception(f"Command timed out after {timeout} seconds")
     except Exception as e:
         logger.error(f"RTC Error: {command} - {str(e)}")
         raise
-
-def get_next_available_port():
-    used_ports = set()
+    finally:
+        # Invalidate once the command has finished, even if it failed part-way
+        if lifecycle:
+            if "--all" in argv:
+                invalidate_container_stats()
+                rtc_shell_pool.close_all()
+            else:
+                for name in argv[2:4]:
+                    if not name.startswith("-"):
+                        invalidate_container_stats(name)
+                        rtc_shell_pool.discard(name)
+
+async def provision_container(image, container_name, ram_mb, cpu, disk_gb):
+    """Create, configure and start a container with as few RTC calls as possible"""
+    # Limits, nesting and the root disk size are applied by init itself instead of one config call each
+    # Increased timeout to 600s for initialization as it may involve pulling images
+    await execute_RTC([
+        "RTC", "init", image, container_name, "--storage", DEFAULT_STORAGE_POOL,
+        "-c", f"limits.memory={ram_mb}MB",
+        "-c", f"limits.cpu={cpu}",
+        "-c", "security.nesting=true",
+        "-d", f"root,size={disk_gb}GB",
+    ], timeout=600)
+    # Enable KVM Support (/dev/kvm access)
+    await execute_RTC(["RTC", "config", "device", "add", container_name, "kvm", "unix-char", "path=/dev/kvm"])
+    await execute_RTC(["RTC", "start", container_name])
+
+async def apply_resource_limits(container_name, ram_mb=None, cpu=None, disk_gb=None):
+    """Apply new RAM/CPU/disk limits, setting both config keys in a single RTC call"""
+    limits = []
+    if ram_mb is not None:
+        limits.append(f"limits.memory={ram_mb}MB")
+    if cpu is not None:
+        limits.append(f"limits.cpu={cpu}")
+    if limits:
+        await execute_RTC(["RTC", "config", "set", container_name, *limits])
+    # The root disk is a device, not a config key, so it needs its own call
+    if disk_gb is not None:
+        await execute_RTC(["RTC", "config", "device", "set", container_name, "root", "size", f"{disk_gb}GB"])
+
+# Host port pool for port forwards, built once from port_data and kept in sync on add/remove
+PORT_RANGE_START = 10000
+PORT_RANGE_END = 20000
+
+def build_port_pool():
+    """Return (free ports as a min-heap, set of ports in use) from port_data"""
+    used = {port_info["host_port"] for user_ports in port_data["active_ports"].values() for port_info in user_ports.values()}
+    # An ascending list is already a valid heap
+    free = [p for p in range(PORT_RANGE_START, PORT_RANGE_END) if p not in used]
+    return free, used
+
+free_ports, used_ports = build_port_pool()
+
+def allocate_port():
+    """Reserve the lowest free host port, or return None if the range is exhausted"""
+    if not free_ports:
+        return None
+    port = heapq.heappop(free_ports)
+    used_ports.add(port)
+    return port
+
+def release_port(port):
+    """Return a host port to the free pool"""
+    if port in used_ports:
+        used_ports.discard(port)
+        heapq.heappush(free_ports, port)
+
+def release_container_ports(container_name):
+    """Forget every port forward to a container and return its host ports to the pool"""
+    # Forwards live on the container as proxy devices, so they go away with an RTC delete
+    released = 0
     for user_ports in port_data["active_ports"].values():
-        for port_info in user_ports:
-            used_ports.add(port_info["host_port"])
-    
-    for p in range(10000, 20000):
-        if p not in used_ports:
-            return p
-    return None
+        for host_port in [p for p, info in user_ports.items() if info["container"] == container_name]:
+            del user_ports[host_port]
+            release_port(host_port)
+            released += 1
+    return released
 
 # Get or create VPS user role
 async def get_or_create_vps_role(guild):
@@ -240,79 +878,79 @@ async def get_or_create_vps_role(guild):
         logger.error(f"Failed to create RathamCloud VPS User role: {e}")
         return None
 
+# CPU usage sampling from /proc/stat
+PROC_STAT_CPU_RE = re.compile(r'^cpu\s+([\d ]+)$', re.MULTILINE)
+
+def parse_proc_stat(text):
+    """Return (idle, total) jiffies from the aggregate cpu line of /proc/stat"""
+    match = PROC_STAT_CPU_RE.search(text)
+    if not match:
+        return None
+    fields = [int(x) for x in match.group(1).split()]
+    if len(fields) < 4:
+        return None
+    idle = fields[3] + (fields[4] if len(fields) > 4 else 0)
+    return idle, sum(fields)
+
+def cpu_pct_between(prev, cur):
+    """CPU usage percentage between two (idle, total) samples"""
+    total_delta = cur[1] - prev[1]
+    if total_delta <= 0:
+        return 0.0
+    return 100.0 * (1 - (cur[0] - prev[0]) / total_delta)
+
+def read_host_cpu_sample():
+    """Read the host /proc/stat cpu line (procfs, never blocks on disk)"""
+    with open('/proc/stat', 'r') as f:
+        return parse_proc_stat(f.readline())
+
+# Previous host /proc/stat sample, so usage is measured since the last check
+host_cpu_sample = None
+
 # Host CPU monitoring function
 async def get_cpu_usage():
     """Get current CPU usage percentage"""
+    global host_cpu_sample
     try:
-        # Get CPU usage using top command asynchronously
-        proc = await asyncio.create_subprocess_exec(
-            'top', '-bn1',
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        stdout, _ = await proc.communicate()
-        output = stdout.decode()
-        
-        # Parse the output to get CPU usage
-        for line in output.split('\n'):
-            if '%Cpu(s):' in line:
-                words = line.split()
-                for i, word in enumerate(words):
-                    if word == 'id,':
-                        idle_str = words[i-1].rstrip(',')
-                        try:
-                            idle = float(idle_str)
-                            usage = 100.0 - idle
-                            return usage
-                        except ValueError:
-                            pass
-                break
-        return 0.0
+        prev, sample = host_cpu_sample, read_host_cpu_sample()
+        if sample is None:
+            return 0.0
+        if prev is None or sample[1] <= prev[1]:
+            await asyncio.sleep(0.1)
+            prev, sample = sample, read_host_cpu_sample()
+            if sample is None:
+                return 0.0
+        host_cpu_sample = sample
+        return cpu_pct_between(prev, sample)
     except Exception as e:
         logger.error(f"Error getting CPU usage: {e}")
         return 0.0
 
-async def cpu_monitor():
-    """Monitor CPU usage and stop all VPS if threshold is exceeded"""
-    global cpu_monitor_active
-    
-    while cpu_monitor_active:
+async def check_host_cpu():
+    """Stop all VPS if host CPU usage exceeds the threshold"""
+    cpu_usage = await get_cpu_usage()
+    logger.info(f"Current CPU usage: {cpu_usage}%")
+
+    if cpu_usage > CPU_THRESHOLD:
+        logger.warning(f"CPU usage ({cpu_usage}%) exceeded threshold ({CPU_THRESHOLD}%). Stopping all VPS.")
+
         try:
-            cpu_usage = await get_cpu_usage()
-            logger.info(f"Current CPU usage: {cpu_usage}%")
-            
-            if cpu_usage > CPU_THRESHOLD:
-                logger.warning(f"CPU usage ({cpu_usage}%) exceeded threshold ({CPU_THRESHOLD}%). Stopping all VPS.")
-                
-                try:
-                    await execute_RTC('RTC stop --all --force')
-                    logger.info("All VPS stopped due to high CPU usage")
-                    
-                    # Update all VPS status in database
-                    for user_id, vps_list in list(vps_data.items()):
-                        for vps in vps_list:
-                            if vps.get('status') == 'running':
-                                vps['status'] = 'stopped'
-                    save_data()
-                except Exception as e:
-                    logger.error(f"Error stopping all VPS: {e}")
-            
-            await asyncio.sleep(60)  # Check host every 60 seconds
+            await execute_RTC(["RTC", "stop", "--all", "--force"])
+            logger.info("All VPS stopped due to high CPU usage")
+
+            # Update all VPS status in database
+            for user_id, vps in container_index.values():
+                if vps['status'] == 'running':
+                    set_vps_state(vps, status='stopped')
+            mark_dirty()
         except Exception as e:
-            logger.error(f"Error in CPU monitor: {e}")
-            await asyncio.sleep(60)
+            logger.error(f"Error stopping all VPS: {e}")
 
 # Helper functions for container stats
-async def get_container_status(container_name):
+async def fetch_container_status(container_name):
     """Get the status of the RTC container"""
     try:
-        proc = await asyncio.create_subprocess_exec(
-            RTC_EXECUTABLE, "info", container_name,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        stdout, _ = await proc.communicate()
-        output = stdout.decode()
+        _, output, _ = await run_RTC(["RTC", "info", container_name])
         for line in output.splitlines():
             if line.startswith("Status: "):
                 return line.split(": ", 1)[1].strip()
@@ -320,153 +958,352 @@ async def get_container_status(container_name):
     except Exception:
         return "Unknown"
 
+# Recent statuses per container: {container_name: (expires_at, status)}, plus the lookup in flight for each
+container_status_cache = {}
+container_status_inflight = {}
+
+async def get_container_status(container_name, max_age=None):
+    """Get the container status, reusing a recent result and sharing one `RTC info` between concurrent callers"""
+    if max_age is None:
+        max_age = CONTAINER_STATS_TTL
+    if max_age <= 0:
+        return await fetch_container_status(container_name)
+    cached = container_status_cache.get(container_name)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+    task = container_status_inflight.get(container_name)
+    if task is None:
+        async def fetch():
+            status = await fetch_container_status(container_name)
+            # Only cached if no lifecycle command invalidated the container while this was running
+            if container_status_inflight.get(container_name) is task:
+                del container_status_inflight[container_name]
+                container_status_cache[container_name] = (time.monotonic() + max_age, status)
+            return status
+        task = container_status_inflight[container_name] = asyncio.ensure_future(fetch())
+    # Shielded so one caller giving up does not cancel the lookup for the others
+    return await asyncio.shield(task)
+
+# Sections are separated by '---' lines so one exec covers CPU, RAM and disk
+CONTAINER_STATS_SCRIPT = "cat /proc/stat; echo ---; cat /proc/meminfo; echo ---; stat -f -c '%b %f %a %S' /"
+
+# Previous /proc/stat samples per container, so each check needs a single exec
+container_cpu_samples = {}
+
+def parse_meminfo(text):
+    """Return (used_mb, total_mb) from /proc/meminfo, counting MemAvailable as free"""
+    fields = {}
+    for line in text.splitlines():
+        key, _, rest = line.partition(':')
+        if key in ('MemTotal', 'MemAvailable'):
+            fields[key] = int(rest.split()[0])
+            if len(fields) == 2:
+                break
+    if 'MemTotal' not in fields:
+        return None
+    total = fields['MemTotal'] // 1024
+    available = fields.get('MemAvailable', fields['MemTotal']) // 1024
+    return total - available, total
+
+def parse_statfs_output(text):
+    """Return a used/size (percent) string from `stat -f -c '%b %f %a %S' /` output, computed like df"""
+    try:
+        blocks, free, available, block_size = (int(x) for x in text.split())
+    except ValueError:
+        return "Unknown"
+    used = (blocks - free) * block_size
+    usable = used + available * block_size
+    if usable <= 0:
+        return "Unknown"
+    # df rounds the percentage up
+    perc = -(-used * 100 // usable)
+    return f"{used >> 30}G/{(blocks * block_size) >> 30}G ({perc}%)"
+
+async def read_container_cpu_sample(container_name):
+    """Read the container /proc/stat cpu line"""
+    _, stdout, _ = await run_RTC(["RTC", "exec", container_name, "--", "cat", "/proc/stat"])
+    return parse_proc_stat(stdout)
+
+async def container_cpu_pct_from_sample(container_name, sample):
+    """Turn a fresh /proc/stat sample into a CPU percentage using the cached previous one"""
+    if sample is None:
+        return 0.0
+    prev = container_cpu_samples.get(container_name)
+    # No usable previous sample (first check or counters reset by a restart)
+    if prev is None or sample[1] <= prev[1]:
+        await asyncio.sleep(0.1)
+        prev, sample = sample, await read_container_cpu_sample(container_name)
+        if sample is None:
+            return 0.0
+    container_cpu_samples[container_name] = sample
+    return cpu_pct_between(prev, sample)
+
+@dataclass
+class ContainerStats:
+    """Live resource usage of a container"""
+    cpu_pct: float = 0.0
+    ram_pct: float = 0.0
+    ram_text: str = "Unknown"
+    disk_text: str = "Unknown"
+
+    @property
+    def cpu_text(self):
+        return f"{self.cpu_pct:.1f}%"
+
+# Recent stats per container: {container_name: (expires_at, ContainerStats)}
+CONTAINER_STATS_TTL = 5
+container_stats_cache = {}
+# One lock per container so concurrent misses share a single fetch
+container_stats_locks = {}
+# Marker of the fetch currently running per container; invalidation drops it so a stale result is not cached
+container_stats_pending = {}
+
+def invalidate_container_stats(container_name=None):
+    """Drop cached stats and status for a container, or for every container when no name is given"""
+    if container_name is None:
+        container_stats_cache.clear()
+        container_stats_pending.clear()
+        container_status_cache.clear()
+        container_status_inflight.clear()
+    else:
+        container_stats_cache.pop(container_name, None)
+        container_stats_pending.pop(container_name, None)
+        container_status_cache.pop(container_name, None)
+        container_status_inflight.pop(container_name, None)
+
+async def fetch_container_stats(container_name):
+    """Get CPU, RAM and disk usage inside the container with a single exec"""
+    stats = ContainerStats()
+    try:
+        _, stdout, _ = await run_RTC(["RTC", "exec", container_name, "--", "sh", "-c", CONTAINER_STATS_SCRIPT])
+        sections = stdout.split('---\n')
+        if len(sections) < 3:
+            return stats
+        cpu_text, meminfo_text, statfs_text = sections[:3]
+
+        stats.cpu_pct = await container_cpu_pct_from_sample(container_name, parse_proc_stat(cpu_text))
+        memory = parse_meminfo(meminfo_text)
+        if memory:
+            used, total = memory
+            stats.ram_pct = (used / total * 100) if total > 0 else 0
+            stats.ram_text = f"{used}/{total} MB ({stats.ram_pct:.1f}%)"
+        stats.disk_text = parse_statfs_output(statfs_text)
+    except Exception as e:
+        logger.error(f"Error getting stats for {container_name}: {e}")
+    return stats
+
+async def get_container_stats(container_name, max_age=CONTAINER_STATS_TTL):
+    """Get container stats, reusing a result fetched within the last max_age seconds"""
+    cached = container_stats_cache.get(container_name)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+    lock = container_stats_locks.setdefault(container_name, asyncio.Lock())
+    async with lock:
+        # Another caller may have refreshed the entry while we waited
+        cached = container_stats_cache.get(container_name)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        marker = container_stats_pending[container_name] = object()
+        stats = await fetch_container_stats(container_name)
+        # Only cached if no lifecycle command invalidated the container while this was running
+        if container_stats_pending.get(container_name) is marker:
+            del container_stats_pending[container_name]
+            container_stats_cache[container_name] = (time.monotonic() + max_age, stats)
+    return stats
+
 async def get_container_cpu(container_name):
     """Get CPU usage inside the container as string"""
-    usage = await get_container_cpu_pct(container_name)
-    return f"{usage:.1f}%"
+    return (await get_container_stats(container_name)).cpu_text
 
 async def get_container_cpu_pct(container_name):
     """Get CPU usage percentage inside the container as float"""
-    try:
-        proc = await asyncio.create_subprocess_exec(
-            RTC_EXECUTABLE, "exec", container_name, "--", "top", "-bn1",
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        stdout, _ = await proc.communicate()
-        output = stdout.decode()
-        for line in output.splitlines():
-            if '%Cpu(s):' in line:
-                words = line.split()
-                for i, word in enumerate(words):
-                    if word == 'id,':
-                        idle_str = words[i-1].rstrip(',')
-                        try:
-                            idle = float(idle_str)
-                            usage = 100.0 - idle
-                            return usage
-                        except ValueError:
-                            pass
-                break
-        return 0.0
-    except Exception as e:
-        logger.error(f"Error getting CPU for {container_name}: {e}")
-        return 0.0
+    return (await get_container_stats(container_name)).cpu_pct
 
 async def get_container_memory(container_name):
     """Get memory usage inside the container"""
-    try:
-        proc = await asyncio.create_subprocess_exec(
-            RTC_EXECUTABLE, "exec", container_name, "--", "free", "-m",
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        stdout, _ = await proc.communicate()
-        lines = stdout.decode().splitlines()
-        if len(lines) > 1:
-            parts = lines[1].split()
-            total = int(parts[1])
-            used = int(parts[2])
-            usage_pct = (used / total * 100) if total > 0 else 0
-            return f"{used}/{total} MB ({usage_pct:.1f}%)"
-        return "Unknown"
-    except Exception:
-        return "Unknown"
+    return (await get_container_stats(container_name)).ram_text
 
 async def get_container_ram_pct(container_name):
     """Get RAM usage percentage inside the container as float"""
-    try:
-        proc = await asyncio.create_subprocess_exec(
-            RTC_EXECUTABLE, "exec", container_name, "--", "free", "-m",
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        stdout, _ = await proc.communicate()
-        lines = stdout.decode().splitlines()
-        if len(lines) > 1:
-            parts = lines[1].split()
-            total = int(parts[1])
-            used = int(parts[2])
-            usage_pct = (used / total * 100) if total > 0 else 0
-            return usage_pct
-        return 0.0
-    except Exception as e:
-        logger.error(f"Error getting RAM for {container_name}: {e}")
-        return 0.0
+    return (await get_container_stats(container_name)).ram_pct
 
 async def get_container_disk(container_name):
     """Get disk usage inside the container"""
-    try:
-        proc = await asyncio.create_subprocess_exec(
-            RTC_EXECUTABLE, "exec", container_name, "--", "df", "-h", "/",
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        stdout, _ = await proc.communicate()
-        lines = stdout.decode().splitlines()
-        for line in lines:
-            if '/dev/' in line and ' /' in line:
-                parts = line.split()
-                if len(parts) >= 5:
-                    used = parts[2]
-                    size = parts[1]
-                    perc = parts[4]
-                    return f"{used}/{size} ({perc})"
-        return "Unknown"
-    except Exception:
-        return "Unknown"
+    return (await get_container_stats(container_name)).disk_text
 
 def get_uptime():
-    """Get host uptime"""
+    """Get host uptime in `uptime`-style format, read from procfs instead of forking"""
     try:
-        result = subprocess.run(['uptime'], capture_output=True, text=True)
-        return result.stdout.strip()
+        with open('/proc/uptime', 'r') as f:
+            seconds = int(float(f.read().split()[0]))
+        with open('/proc/loadavg', 'r') as f:
+            load = ", ".join(f.read().split()[:3])
+        days, rem = divmod(seconds, 86400)
+        hours, rem = divmod(rem, 3600)
+        minutes = rem // 60
+        up = f"{hours}:{minutes:02d}" if hours else f"{minutes} min"
+        if days:
+            up = f"{days} day{'s' if days != 1 else ''}, {up}"
+        return f"{time.strftime('%H:%M:%S')} up {up}, load average: {load}"
     except Exception:
         return "Unknown"
 
+# Discord users fetched over REST, least recently used first
+USER_CACHE_SIZE = 256
+user_cache = OrderedDict()
+
+async def resolve_user(user_id):
+    """Get a Discord user from the client cache, the local LRU, or the API"""
+    user_id = int(user_id)
+    user = bot.get_user(user_id)
+    if user is not None:
+        return user
+    user = user_cache.get(user_id)
+    if user is not None:
+        user_cache.move_to_end(user_id)
+        return user
+    user = await bot.fetch_user(user_id)
+    user_cache[user_id] = user
+    if len(user_cache) > USER_CACHE_SIZE:
+        user_cache.popitem(last=False)
+    return user
+
+# Concurrent fetch_user calls when resolving many users at once
+USER_FETCH_CONCURRENCY = 5
+
+async def resolve_users(user_ids):
+    """Resolve many user IDs concurrently: {user_id: user, or None if the account is gone or could not be fetched}"""
+    semaphore = asyncio.Semaphore(USER_FETCH_CONCURRENCY)
+
+    async def resolve(user_id):
+        async with semaphore:
+            try:
+                return await resolve_user(user_id)
+            except discord.NotFound:
+                return None
+            except discord.HTTPException as e:
+                # Rate limits and server errors show the raw ID rather than failing the whole listing
+                logger.warning(f"Failed to fetch user {user_id}: {e}")
+                return None
+
+    user_ids = list(user_ids)
+    users = await asyncio.gather(*(resolve(uid) for uid in user_ids))
+    return dict(zip(user_ids, users))
+
+# Fire-and-forget tasks (e.g. owner DMs); referenced here so they are not garbage collected mid-run
+background_tasks = set()
+
+def spawn_background(coro):
+    """Run a coroutine without waiting for it"""
+    task = asyncio.create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
+
+async def notify_suspended(user_id, container_name, reason):
+    """DM the owner of a VPS an admin has suspended"""
+    try:
+        owner = await resolve_user(user_id)
+        embed = create_warning_embed("🚨 RathamCloud VPS Suspended", f"Your VPS `{container_name}` has been suspended by an admin.\n\n**Reason:** {reason}\n\nContact a RathamCloud admin to unsuspend.")
+        await owner.send(embed=embed)
+    except Exception as dm_e:
+        logger.error(f"Failed to DM owner {user_id}: {dm_e}")
+
+# Concurrent DMs sent by the monitor, kept low to stay clear of Discord rate limits
+NOTIFY_CONCURRENCY = 5
+
+async def notify_auto_suspended(user_id, container, reason, semaphore):
+    """DM the owner of an auto-suspended VPS"""
+    async with semaphore:
+        try:
+            owner = await resolve_user(user_id)
+            embed = create_warning_embed("🚨 VPS Auto-Suspended", f"Your VPS `{container}` has been automatically suspended due to high resource usage.\n\n**Reason:** {reason}\n\nContact RathamCloud admin to unsuspend and address the issue.")
+            await owner.send(embed=embed)
+        except Exception as dm_e:
+            logger.error(f"Failed to DM owner {user_id}: {dm_e}")
+
 # VPS monitoring task
-async def vps_monitor():
-    """Monitor each VPS for high CPU/RAM usage every 10 minutes"""
+async def collect_vps_usage(container_name, semaphore):
+    """Fetch container stats, bounded by the semaphore"""
+    async with semaphore:
+        return await get_container_stats(container_name)
+
+async def check_all_vps():
+    """Suspend running VPS whose CPU or RAM usage exceeds the thresholds"""
+    running = [
+        (user_id, vps)
+        for user_id, vps in container_index.values()
+        if vps['status'] == 'running' and not vps['suspended']
+    ]
+    # Collect stats for all running VPS concurrently, capped to avoid flooding the host with execs
+    semaphore = asyncio.Semaphore(MONITOR_CONCURRENCY)
+    results = await asyncio.gather(
+        *(collect_vps_usage(vps['container_name'], semaphore) for _, vps in running),
+        return_exceptions=True
+    )
+    to_notify = []
+    for (user_id, vps), result in zip(running, results):
+        container = vps['container_name']
+        if isinstance(result, Exception):
+            logger.error(f"Error collecting stats for {container}: {result}")
+            continue
+        cpu, ram = result.cpu_pct, result.ram_pct
+        # Skip VPS that were deleted or changed state while stats were being collected
+        if container_index.get(container, (None, None))[1] is not vps:
+            continue
+        if vps['status'] != 'running' or vps['suspended']:
+            continue
+        if cpu > CPU_THRESHOLD or ram > RAM_THRESHOLD:
+            reason = f"High resource usage: CPU {cpu:.1f}%, RAM {ram:.1f}% (threshold: {CPU_THRESHOLD}% CPU / {RAM_THRESHOLD}% RAM)"
+            logger.warning(f"Suspending {container}: {reason}")
+            try:
+                await execute_RTC(["RTC", "stop", container])
+                set_vps_state(vps, status='suspended', suspended=True)
+                vps['suspension_history'].append({
+                    'time': datetime.now().isoformat(),
+                    'reason': reason,
+                    'by': 'RathamCloud Auto-System'
+                })
+                mark_dirty()
+                to_notify.append((user_id, container, reason))
+            except Exception as e:
+                logger.error(f"Failed to suspend {container}: {e}")
+    # DM owners after the sweep so suspensions aren't held up by REST round-trips
+    if to_notify:
+        notify_semaphore = asyncio.Semaphore(NOTIFY_CONCURRENCY)
+        await asyncio.gather(
+            *(notify_auto_suspended(uid, container, reason, notify_semaphore) for uid, container, reason in to_notify),
+            return_exceptions=True
+        )
+
+# Host CPU is checked every minute, per-VPS usage every CHECK_INTERVAL, both from one task
+HOST_CPU_INTERVAL = 60
+
+async def monitor_loop():
+    """Run the host CPU and per-VPS checks as each comes due"""
+    next_cpu = next_vps = time.monotonic()
     while True:
-        try:
-            for user_id, vps_list in list(vps_data.items()):
-                for vps in list(vps_list):
-                    if vps.get('status') == 'running' and not vps.get('suspended', False):
-                        container = vps['container_name']
-                        cpu = await get_container_cpu_pct(container)
-                        ram = await get_container_ram_pct(container)
-                        if cpu > CPU_THRESHOLD or ram > RAM_THRESHOLD:
-                            reason = f"High resource usage: CPU {cpu:.1f}%, RAM {ram:.1f}% (threshold: {CPU_THRESHOLD}% CPU / {RAM_THRESHOLD}% RAM)"
-                            logger.warning(f"Suspending {container}: {reason}")
-                            try:
-                                await execute_RTC(f"RTC stop {container}")
-                                vps['status'] = 'suspended'
-                                vps['suspended'] = True
-                                if 'suspension_history' not in vps:
-                                    vps['suspension_history'] = []
-                                vps['suspension_history'].append({
-                                    'time': datetime.now().isoformat(),
-                                    'reason': reason,
-                                    'by': 'RathamCloud Auto-System'
-                                })
-                                save_data()
-                                # DM owner
-                                try:
-                                    owner = await bot.fetch_user(int(user_id))
-                                    embed = create_warning_embed("🚨 VPS Auto-Suspended", f"Your VPS `{container}` has been automatically suspended due to high resource usage.\n\n**Reason:** {reason}\n\nContact RathamCloud admin to unsuspend and address the issue.")
-                                    await owner.send(embed=embed)
-                                except Exception as dm_e:
-                                    logger.error(f"Failed to DM owner {user_id}: {dm_e}")
-                            except Exception as e:
-                                logger.error(f"Failed to suspend {container}: {e}")
-            await asyncio.sleep(CHECK_INTERVAL)
-        except Exception as e:
-            logger.error(f"VPS monitor error: {e}")
-            await asyncio.sleep(60)
+        now = time.monotonic()
+        if now >= next_cpu:
+            next_cpu = now + HOST_CPU_INTERVAL
+            rtc_shell_pool.evict_idle()
+            if cpu_monitor_active:
+                try:
+                    await check_host_cpu()
+                except Exception as e:
+                    logger.error(f"Error in CPU monitor: {e}")
+        if now >= next_vps:
+            next_vps = now + CHECK_INTERVAL
+            try:
+                await check_all_vps()
+            except Exception as e:
+                logger.error(f"VPS monitor error: {e}")
+        await asyncio.sleep(max(0, min(next_cpu, next_vps) - time.monotonic()))
 
 # Bot events
 @bot.event
 async def on_ready():
+    global data_flusher_task, monitor_task
     logger.info(f'{bot.user} has connected to Discord!')
     
     # To sync to a specific test server instantly, uncomment and set your Guild ID:
@@ -482,8 +1319,10 @@ async def on_ready():
     except Exception as e:
         logger.error(f"Failed to sync slash commands: {e}")
     await bot.change_presence(activity=discord.Activity(type=discord.ActivityType.watching, name="RathamCloud VPS Manager"))
-    bot.loop.create_task(vps_monitor())
-    bot.loop.create_task(cpu_monitor())
+    if data_flusher_task is None or data_flusher_task.done():
+        data_flusher_task = bot.loop.create_task(data_flusher())
+    if monitor_task is None or monitor_task.done():
+        monitor_task = bot.loop.create_task(monitor_loop())
     logger.info("RathamCloud Bot is ready! VPS monitoring started.")
 
 @bot.event
@@ -625,16 +1464,8 @@ async def dynamic_autocomplete_register(ctx, guild_id: int):
         interaction: discord.Interaction, 
         current: str
     ) -> List[app_commands.Choice[str]]:
-        choices = []
-        # Search through all containers in vps_data
-        for user_id, vps_list in vps_data.items():
-            for vps in vps_list:
-                name = vps['container_name']
-                if current.lower() in name.lower():
-                    choices.append(app_commands.Choice(name=name, value=name))
-        
         # Limit to 25 choices (Discord's maximum)
-        return choices[:25]
+        return [app_commands.Choice(name=name, value=name) for name in search_container_names(current, 25)]
 
     # 2. Define the main command callback
     async def search_callback(interaction: discord.Interaction, container_name: str):
@@ -702,8 +1533,10 @@ async def my_vps(ctx):
 async def RTC_list(ctx):
     """List all RTC containers"""
     try:
-        result = await execute_RTC("RTC list")
-        embed = create_info_embed("RathamCloud RTC Containers List", result)
+        returncode, stdout, stderr = await run_RTC_listing(["RTC", "list"])
+        if returncode != 0:
+            raise Exception(stderr or "Command failed with no error output")
+        embed = create_info_embed("RathamCloud RTC Containers List", stdout or "No containers")
         await ctx.send(embed=embed)
     except Exception as e:
         await ctx.send(embed=create_error_embed("Error", str(e)))
@@ -732,14 +1565,14 @@ async def create_vps(ctx, ram: int, cpu: int, disk: int, user: discord.Member, o
         return
 
     user_id = str(user.id)
-    if user_id not in vps_data:
-        vps_data[user_id] = []
+    vps_data.setdefault(user_id, [])
 
     # Find a unique container name that doesn't exist in the system or JSON
     vps_count = len(vps_data[user_id]) + 1
     while True:
         container_name = f"RathamCloud-vps-{user_id}-{vps_count}"
-        status = await get_container_status(container_name)
+        # Always asked fresh: a stale answer here could hand out a name that is already taken
+        status = await get_container_status(container_name, max_age=0)
         if status == "Unknown":
             break
         vps_count += 1
@@ -749,41 +1582,33 @@ async def create_vps(ctx, ram: int, cpu: int, disk: int, user: discord.Member, o
     await ctx.send(embed=create_info_embed("Creating RathamCloud VPS", f"Deploying VPS for {user.mention}..."))
 
     try:
-        # Increased timeout to 600s for initialization as it may involve pulling images
-        await execute_RTC(f"RTC init {os_type} {container_name} --storage {DEFAULT_STORAGE_POOL}", timeout=600)
-        await execute_RTC(f"RTC config set {container_name} limits.memory {ram_mb}MB")
-        await execute_RTC(f"RTC config set {container_name} limits.cpu {cpu}")
-        
-        # Enable KVM Support (Nesting and /dev/kvm access)
-        await execute_RTC(f"RTC config set {container_name} security.nesting true")
-        await execute_RTC(f"RTC config device add {container_name} kvm unix-char path=/dev/kvm")
-
-        # Always resize the disk to specified size
-        await execute_RTC(f"RTC config device set {container_name} root size {disk}GB")
-        # Start to apply changes
-        await execute_RTC(f"RTC start {container_name}")
+        await provision_container(os_type, container_name, ram_mb, cpu, disk)
 
         os_name = "Ubuntu" if "ubuntu" in os_type else "Debian"
         config_str = f"{os_name} | {ram}GB RAM / {cpu} CPU / {disk}GB Disk"
         vps_info = {
             "container_name": container_name,
             "ram": f"{ram}GB",
-            "cpu": str(cpu),
+            "cpu": cpu,
             "storage": f"{disk}GB",
+            "ram_gb": ram,
+            "disk_gb": disk,
             "config": config_str,
             "status": "running",
             "suspended": False,
             "suspension_history": [],
             "created_at": datetime.now().isoformat(),
-            "shared_with": []
+            "shared_with": set()
         }
         vps_data[user_id].append(vps_info)
-        save_data()
+        index_vps(user_id, vps_info)
+        mark_dirty()
 
         # Get or create VPS role and assign to user
         if ctx.guild:
             vps_role = await get_or_create_vps_role(ctx.guild)
-            if vps_role:
+            # Skip the API call if the user already has the role from an earlier VPS
+            if vps_role and not user.get_role(vps_role.id):
                 try:
                     await user.add_roles(vps_role, reason="RathamCloud VPS ownership granted")
                 except discord.Forbidden:
@@ -791,18 +1616,22 @@ async def create_vps(ctx, ram: int, cpu: int, disk: int, user: discord.Member, o
 
         # Create success embed for channel
         embed = create_success_embed("RathamCloud VPS Created Successfully")
-        add_field(embed, "Owner", user.mention, True)
-        add_field(embed, "VPS ID", f"#{vps_count}", True)
-        add_field(embed, "Container", f"`{container_name}`", True)
-        add_field(embed, "Resources", f"**OS:** {os_name}\n**RAM:** {ram}GB\n**CPU:** {cpu} Cores\n**Storage:** {disk}GB", False)
+        add_fields(embed, [
+            ("Owner", user.mention, True),
+            ("VPS ID", f"#{vps_count}", True),
+            ("Container", f"`{container_name}`", True),
+            ("Resources", f"**OS:** {os_name}\n**RAM:** {ram}GB\n**CPU:** {cpu} Cores\n**Storage:** {disk}GB", False),
+        ])
         await ctx.send(embed=embed)
 
         # Send comprehensive DM to user
         try:
             dm_embed = create_success_embed("RathamCloud VPS Created!", f"Your VPS has been successfully deployed by an admin!")
-            add_field(dm_embed, "VPS Details", f"**VPS ID:** #{vps_count}\n**Container Name:** `{container_name}`\n**Configuration:** {config_str}\n**Status:** Running\n**Created:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", False)
-            add_field(dm_embed, "Management", "• Use `!manage` to start/stop/reinstall your RathamCloud VPS\n• Use `!manage` → SSH for terminal access\n• Contact RathamCloud admin for upgrades or issues", False)
-            add_field(dm_embed, "Important Notes", f"• Full root access via SSH\n• {os_name} pre-installed\n• Back up your data regularly with RathamCloud tools", False)
+            add_fields(dm_embed, [
+                ("VPS Details", f"**VPS ID:** #{vps_count}\n**Container Name:** `{container_name}`\n**Configuration:** {config_str}\n**Status:** Running\n**Created:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", False),
+                ("Management", "• Use `!manage` to start/stop/reinstall your RathamCloud VPS\n• Use `!manage` → SSH for terminal access\n• Contact RathamCloud admin for upgrades or issues", False),
+                ("Important Notes", f"• Full root access via SSH\n• {os_name} pre-installed\n• Back up your data regularly with RathamCloud tools", False),
+            ])
             await user.send(embed=dm_embed)
         except discord.Forbidden:
             await ctx.send(embed=create_info_embed("Notification Failed", f"Couldn't send DM to {user.mention}. Please ensure DMs are enabled."))
@@ -854,64 +1683,87 @@ class ConfirmReinstallView(discord.ui.View):
     @discord.ui.button(label="Confirm Reinstall", style=discord.ButtonStyle.danger)
     async def confirm(self, interaction: discord.Interaction, button: discord.ui.Button):
         await interaction.response.defer(ephemeral=True)
-        try:
-            await interaction.followup.send(embed=create_info_embed("Reinstalling", f"Stopping and removing `{self.container_name}`..."), ephemeral=True)
-            
-            # Force stop and delete
+        if await reject_if_busy(interaction, self.container_name):
+            return
+        async with container_action_locks[self.container_name]:
             try:
-                await execute_RTC(f"RTC stop {self.container_name} --force")
-            except Exception:
-                pass
-            await execute_RTC(f"RTC delete {self.container_name} --force")
-
-            # Recreate with selected OS
-            await interaction.followup.send(embed=create_info_embed("Deploying", f"Installing {self.label} in `{self.container_name}`..."), ephemeral=True)
+                await interaction.followup.send(embed=create_info_embed("Reinstalling", f"Stopping and removing `{self.container_name}`..."), ephemeral=True)
+            
+                # --force stops the container if it is running and deletes it in one call
+                await execute_RTC(["RTC", "delete", self.container_name, "--force"])
+                tmate_ready.discard(self.container_name)
+                if release_container_ports(self.container_name):
+                    mark_dirty()
+
+                # Recreate with selected OS
+                await interaction.followup.send(embed=create_info_embed("Deploying", f"Installing {self.label} in `{self.container_name}`..."), ephemeral=True)
             
-            original_ram = self.vps["ram"]
-            original_cpu = self.vps["cpu"]
-            original_storage = self.vps["storage"]
-            ram_gb = int(original_ram.replace("GB", ""))
-            ram_mb = ram_gb * 1024
-            storage_gb = int(original_storage.replace("GB", ""))
-
-            # Use 600s timeout for image pulling
-            await execute_RTC(f"RTC init {self.image} {self.container_name} --storage {DEFAULT_STORAGE_POOL}", timeout=600)
-            await execute_RTC(f"RTC config set {self.container_name} limits.memory {ram_mb}MB")
-            await execute_RTC(f"RTC config set {self.container_name} limits.cpu {original_cpu}")
-            await execute_RTC(f"RTC config device set {self.container_name} root size {storage_gb}GB")
-
-            # Enable KVM Support (Nesting and /dev/kvm access)
-            await execute_RTC(f"RTC config set {self.container_name} security.nesting true")
-            await execute_RTC(f"RTC config device add {self.container_name} kvm unix-char path=/dev/kvm")
-
-            await execute_RTC(f"RTC start {self.container_name}")
-
-            # Update database
-            self.vps["status"] = "running"
-            self.vps["suspended"] = False
-            self.vps["created_at"] = datetime.now().isoformat()
+                original_cpu = self.vps["cpu"]
+                ram_gb = self.vps["ram_gb"]
+                ram_mb = ram_gb * 1024
+                storage_gb = self.vps["disk_gb"]
+
+                await provision_container(self.image, self.container_name, ram_mb, original_cpu, storage_gb)
+
+                # Update database
+                set_vps_state(self.vps, status="running", suspended=False)
+                self.vps["created_at"] = datetime.now().isoformat()
             
-            # Update config string to include OS info
-            os_short = "Ubuntu" if "ubuntu" in self.image else "Debian"
-            config_str = f"{os_short} | {ram_gb}GB RAM / {original_cpu} CPU / {storage_gb}GB Disk"
-            self.vps["config"] = config_str
+                # Update config string to include OS info
+                os_short = "Ubuntu" if "ubuntu" in self.image else "Debian"
+                config_str = f"{os_short} | {ram_gb}GB RAM / {original_cpu} CPU / {storage_gb}GB Disk"
+                self.vps["config"] = config_str
             
-            save_data()
+                mark_dirty()
             
-            await interaction.followup.send(embed=create_success_embed("Reinstall Complete", f"RathamCloud VPS `{self.container_name}` has been reinstalled with **{self.label}**!"), ephemeral=True)
+                await interaction.followup.send(embed=create_success_embed("Reinstall Complete", f"RathamCloud VPS `{self.container_name}` has been reinstalled with **{self.label}**!"), ephemeral=True)
 
-            # Refresh the management view
-            new_embed = await self.parent_view.create_vps_embed(self.parent_view.selected_index)
-            await interaction.followup.send(embed=new_embed, ephemeral=True)
+                # Refresh the management view
+                new_embed = await self.parent_view.create_vps_embed(self.parent_view.selected_index)
+                await interaction.followup.send(embed=new_embed, ephemeral=True)
 
-        except Exception as e:
-            await interaction.followup.send(embed=create_error_embed("Reinstall Failed", f"Error: {str(e)}"), ephemeral=True)
+            except Exception as e:
+                await interaction.followup.send(embed=create_error_embed("Reinstall Failed", f"Error: {str(e)}"), ephemeral=True)
 
     @discord.ui.button(label="Cancel", style=discord.ButtonStyle.secondary)
     async def cancel(self, interaction: discord.Interaction, button: discord.ui.Button):
         new_embed = await self.parent_view.create_vps_embed(self.parent_view.selected_index)
         await interaction.response.edit_message(embed=new_embed, view=self.parent_view)
 
+# One power/reinstall action at a time per container; further clicks are turned away while it runs
+container_action_locks = defaultdict(asyncio.Lock)
+
+async def reject_if_busy(interaction, container_name):
+    """Tell the user an action is already running on the container; returns True if so"""
+    if not container_action_locks[container_name].locked():
+        return False
+    embed = create_warning_embed("Action In Progress", f"Another action is already running on `{container_name}`. Please wait for it to finish.")
+    if interaction.response.is_done():
+        await interaction.followup.send(embed=embed, ephemeral=True)
+    else:
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    return True
+
+# Waits between polls for the tmate SSH link after starting a session
+TMATE_POLL_DELAYS = (0.1, 0.2, 0.4, 0.8, 1.5)
+
+# Containers where tmate is known to be installed; cleared when the container is reinstalled
+tmate_ready = set()
+
+# Formatted allocation lines for the manage embed: {container_name: (source fields, fragments)}
+vps_embed_fragments = {}
+
+def vps_resource_fragments(vps):
+    """Return the (configuration line, RAM/CPU/storage lines) of a VPS, rebuilt only when they change"""
+    fields = (vps.get('config', 'Custom'), vps['ram'], vps['cpu'], vps['storage'])
+    cached = vps_embed_fragments.get(vps['container_name'])
+    if cached and cached[0] == fields:
+        return cached[1]
+    config, ram, cpu, storage = fields
+    fragments = (f"**Configuration:** {config}\n", f"**RAM:** {ram}\n**CPU:** {cpu} Cores\n**Storage:** {storage}")
+    vps_embed_fragments[vps['container_name']] = (fields, fragments)
+    return fragments
+
 class ManageView(discord.ui.View):
     def __init__(self, user_id, vps_list, is_shared=False, owner_id=None, is_admin=False):
         super().__init__(timeout=300)
@@ -921,6 +1773,8 @@ class ManageView(discord.ui.View):
         self.is_shared = is_shared
         self.owner_id = owner_id or user_id
         self.is_admin = is_admin
+        self.last_embed = None
+        self.last_embed_index = None
 
         if len(vps_list) > 1:
             options = [
@@ -946,22 +1800,28 @@ class ManageView(discord.ui.View):
         self.initial_embed = await self.create_vps_embed(self.selected_index)
         return self.initial_embed
 
-    async def create_vps_embed(self, index):
-        vps = self.vps_list[index]
+    @staticmethod
+    def status_display(vps):
+        """Return the status line text and embed colour for a VPS."""
         status = vps.get('status', 'unknown')
         suspended = vps.get('suspended', False)
         status_color = 0x00ff88 if status == 'running' and not suspended else 0xffaa00 if suspended else 0xff3366
-
-        # Fetch live stats
-        container_name = vps['container_name']
-        RTC_status = await get_container_status(container_name)
-        cpu_usage = await get_container_cpu(container_name)
-        memory_usage = await get_container_memory(container_name)
-        disk_usage = await get_container_disk(container_name)
-
         status_text = f"{status.upper()}"
         if suspended:
             status_text += " (SUSPENDED)"
+        return status_text, status_color
+
+    async def create_vps_embed(self, index):
+        vps = self.vps_list[index]
+        suspended = vps.get('suspended', False)
+        status_text, status_color = self.status_display(vps)
+
+        # Fetch live stats
+        container_name = vps['container_name']
+        stats = await get_container_stats(container_name)
+        cpu_usage = stats.cpu_text
+        memory_usage = stats.ram_text
+        disk_usage = stats.disk_text
 
         owner_text = ""
         if self.is_admin and self.owner_id != self.user_id:
@@ -977,22 +1837,40 @@ class ManageView(discord.ui.View):
             status_color
         )
 
-        resource_info = f"**Configuration:** {vps.get('config', 'Custom')}\n"
-        resource_info += f"**Status:** `{status_text}`\n"
-        resource_info += f"**RAM:** {vps['ram']}\n"
-        resource_info += f"**CPU:** {vps['cpu']} Cores\n"
-        resource_info += f"**Storage:** {vps['storage']}"
-
-        add_field(embed, "📊 Allocated Resources", resource_info, False)
+        config_line, allocation_lines = vps_resource_fragments(vps)
+        resource_info = f"{config_line}**Status:** `{status_text}`\n{allocation_lines}"
 
+        fields = [("📊 Allocated Resources", resource_info, False)]
         if suspended:
-            add_field(embed, "⚠️ Suspended", "This RathamCloud VPS is suspended. Contact an admin to unsuspend.", False)
-
+            fields.append(("⚠️ Suspended", "This RathamCloud VPS is suspended. Contact an admin to unsuspend.", False))
         live_stats = f"**CPU Usage:** {cpu_usage}\n**Memory:** {memory_usage}\n**Disk:** {disk_usage}"
-        add_field(embed, "📈 Live Usage", live_stats, False)
+        fields.append(("📈 Live Usage", live_stats, False))
+        fields.append(("🎮 Controls", "Use the buttons below to manage your RathamCloud VPS", False))
+        add_fields(embed, fields)
+
+        self.last_embed = embed
+        self.last_embed_index = index
+        return embed
+
+    async def refresh_status_embed(self, index):
+        """Patch the status line of the last rendered embed after a start/stop.
 
-        add_field(embed, "🎮 Controls", "Use the buttons below to manage your RathamCloud VPS", False)
+        Falls back to a full rebuild when nothing usable is cached.
+        """
+        embed = self.last_embed
+        if embed is None or self.last_embed_index != index:
+            return await self.create_vps_embed(index)
 
+        vps = self.vps_list[index]
+        status_text, status_color = self.status_display(vps)
+        config_line, allocation_lines = vps_resource_fragments(vps)
+        resource_info = f"{config_line}**Status:** `{status_text}`\n{allocation_lines}"
+
+        embed.color = status_color
+        resources = embed.fields[0]
+        embed.set_field_at(0, name=resources.name, value=truncate_text(resource_info, 1024), inline=resources.inline)
+        if not vps.get('suspended', False) and len(embed.fields) > 1 and "Suspended" in embed.fields[1].name:
+            embed.remove_field(1)
         return embed
 
     def add_action_buttons(self):
@@ -1043,10 +1921,10 @@ class ManageView(discord.ui.View):
         container_name = vps["container_name"]
 
         if action == 'stats':
-            status = await get_container_status(container_name)
-            cpu_usage = await get_container_cpu(container_name)
-            memory_usage = await get_container_memory(container_name)
-            disk_usage = await get_container_disk(container_name)
+            status, stats = await asyncio.gather(get_container_status(container_name), get_container_stats(container_name))
+            cpu_usage = stats.cpu_text
+            memory_usage = stats.ram_text
+            disk_usage = stats.disk_text
             stats_embed = create_info_embed("📈 RathamCloud Live Statistics", f"Real-time stats for `{container_name}`")
             add_field(stats_embed, "Status", f"`{status.upper()}`", True)
             add_field(stats_embed, "CPU", cpu_usage, True)
@@ -1068,34 +1946,40 @@ class ManageView(discord.ui.View):
             await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
 
         elif action == 'start':
-            await interaction.response.defer(ephemeral=True)
-            if suspended:
-                vps['suspended'] = False
-                save_data()
-            try:
-                await execute_RTC(f"RTC start {container_name}")
-                vps["status"] = "running"
-                save_data()
-                await interaction.followup.send(embed=create_success_embed("VPS Started", f"RathamCloud VPS `{container_name}` is now running!"), ephemeral=True)
-                new_embed = await self.create_vps_embed(self.selected_index)
-                await interaction.message.edit(embed=new_embed, view=self)
-            except Exception as e:
-                await interaction.followup.send(embed=create_error_embed("Start Failed", str(e)), ephemeral=True)
+            if await reject_if_busy(interaction, container_name):
+                return
+            async with container_action_locks[container_name]:
+                await interaction.response.defer(ephemeral=True)
+                if suspended:
+                    set_vps_state(vps, suspended=False)
+                    mark_dirty()
+                try:
+                    await execute_RTC(["RTC", "start", container_name])
+                    set_vps_state(vps, status="running")
+                    mark_dirty()
+                    await interaction.followup.send(embed=create_success_embed("VPS Started", f"RathamCloud VPS `{container_name}` is now running!"), ephemeral=True)
+                    new_embed = await self.refresh_status_embed(self.selected_index)
+                    await interaction.message.edit(embed=new_embed, view=self)
+                except Exception as e:
+                    await interaction.followup.send(embed=create_error_embed("Start Failed", str(e)), ephemeral=True)
 
         elif action == 'stop':
-            await interaction.response.defer(ephemeral=True)
-            if suspended:
-                vps['suspended'] = False
-                save_data()
-            try:
-                await execute_RTC(f"RTC stop {container_name}", timeout=120)
-                vps["status"] = "stopped"
-                save_data()
-                await interaction.followup.send(embed=create_success_embed("VPS Stopped", f"RathamCloud VPS `{container_name}` has been stopped!"), ephemeral=True)
-                new_embed = await self.create_vps_embed(self.selected_index)
-                await interaction.message.edit(embed=new_embed, view=self)
-            except Exception as e:
-                await interaction.followup.send(embed=create_error_embed("Stop Failed", str(e)), ephemeral=True)
+            if await reject_if_busy(interaction, container_name):
+                return
+            async with container_action_locks[container_name]:
+                await interaction.response.defer(ephemeral=True)
+                if suspended:
+                    set_vps_state(vps, suspended=False)
+                    mark_dirty()
+                try:
+                    await execute_RTC(["RTC", "stop", container_name], timeout=120)
+                    set_vps_state(vps, status="stopped")
+                    mark_dirty()
+                    await interaction.followup.send(embed=create_success_embed("VPS Stopped", f"RathamCloud VPS `{container_name}` has been stopped!"), ephemeral=True)
+                    new_embed = await self.refresh_status_embed(self.selected_index)
+                    await interaction.message.edit(embed=new_embed, view=self)
+                except Exception as e:
+                    await interaction.followup.send(embed=create_error_embed("Stop Failed", str(e)), ephemeral=True)
 
         elif action == 'tmate':
             if suspended:
@@ -1104,37 +1988,34 @@ class ManageView(discord.ui.View):
             await interaction.response.send_message(embed=create_info_embed("SSH Access", "Generating RathamCloud SSH connection..."), ephemeral=True)
 
             try:
-                # Check if tmate exists
-                check_proc = await asyncio.create_subprocess_exec(
-                    RTC_EXECUTABLE, "exec", container_name, "--", "which", "tmate",
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-                stdout, stderr = await check_proc.communicate()
-
-                if check_proc.returncode != 0:
+                # Check if tmate exists, unless an earlier click already found or installed it
+                if container_name in tmate_ready:
+                    returncode = 0
+                else:
+                    returncode, _, _ = await run_RTC(["RTC", "exec", container_name, "--", "which", "tmate"])
+
+                if returncode != 0:
                     await interaction.followup.send(embed=create_info_embed("Installing SSH", "Installing tmate..."), ephemeral=True)
                     # Ensure universe repository is enabled for tmate on Ubuntu
-                    await execute_RTC(f"RTC exec {container_name} -- apt-get update")
-                    await execute_RTC(f"RTC exec {container_name} -- apt-get install -y software-properties-common")
-                    await execute_RTC(f"RTC exec {container_name} -- add-apt-repository -y universe")
-                    await execute_RTC(f"RTC exec {container_name} -- apt-get update")
-                    await execute_RTC(f"RTC exec {container_name} -- apt-get install tmate -y")
+                    await execute_RTC(["RTC", "exec", container_name, "--", "apt-get", "update"])
+                    await execute_RTC(["RTC", "exec", container_name, "--", "apt-get", "install", "-y", "software-properties-common"])
+                    await execute_RTC(["RTC", "exec", container_name, "--", "add-apt-repository", "-y", "universe"])
+                    await execute_RTC(["RTC", "exec", container_name, "--", "apt-get", "update"])
+                    await execute_RTC(["RTC", "exec", container_name, "--", "apt-get", "install", "tmate", "-y"])
                     await interaction.followup.send(embed=create_success_embed("Installed", "RathamCloud SSH service installed!"), ephemeral=True)
+                tmate_ready.add(container_name)
 
                 # Start tmate with unique session name using timestamp
                 session_name = f"RathamCloud-session-{datetime.now().strftime('%Y%m%d%H%M%S')}"
-                await execute_RTC(f"RTC exec {container_name} -- tmate -S /tmp/{session_name}.sock new-session -d")
-                await asyncio.sleep(3)
-
-                # Get SSH link
-                ssh_proc = await asyncio.create_subprocess_exec(
-                    RTC_EXECUTABLE, "exec", container_name, "--", "tmate", "-S", f"/tmp/{session_name}.sock", "display", "-p", "#{tmate_ssh}",
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-                stdout, stderr = await ssh_proc.communicate()
-                ssh_url = stdout.decode().strip() if stdout else None
+                await execute_RTC(["RTC", "exec", container_name, "--", "tmate", "-S", f"/tmp/{session_name}.sock", "new-session", "-d"])
+
+                # Get SSH link, polling until tmate has connected (about 3s at most)
+                ssh_url, ssh_error = "", ""
+                for delay in TMATE_POLL_DELAYS:
+                    await asyncio.sleep(delay)
+                    _, ssh_url, ssh_error = await run_RTC(["RTC", "exec", container_name, "--", "tmate", "-S", f"/tmp/{session_name}.sock", "display", "-p", "#{tmate_ssh}"])
+                    if ssh_url:
+                        break
 
                 if ssh_url:
                     try:
@@ -1147,8 +2028,7 @@ class ManageView(discord.ui.View):
                     except discord.Forbidden:
                         await interaction.followup.send(embed=create_error_embed("DM Failed", "Enable DMs to receive RathamCloud SSH link!"), ephemeral=True)
                 else:
-                    error_msg = stderr.decode().strip() if stderr else "Unknown error"
-                    await interaction.followup.send(embed=create_error_embed("SSH Failed", error_msg), ephemeral=True)
+                    await interaction.followup.send(embed=create_error_embed("SSH Failed", ssh_error or "Unknown error"), ephemeral=True)
             except Exception as e:
                 await interaction.followup.send(embed=create_error_embed("SSH Error", str(e)), ephemeral=True)
 
@@ -1159,7 +2039,7 @@ async def manage_vps(ctx, user: discord.Member = None):
     if user:
         # Only admins can manage other users' VPS
         user_id_check = str(ctx.author.id)
-        if user_id_check != str(MAIN_ADMIN_ID) and user_id_check not in admin_data.get("admins", []):
+        if user_id_check not in admin_ids:
             await ctx.send(embed=create_error_embed("Access Denied", "Only RathamCloud admins can manage other users' VPS."))
             return
         
@@ -1185,79 +2065,129 @@ async def manage_vps(ctx, user: discord.Member = None):
         embed = await view.get_initial_embed()
         await ctx.send(embed=embed, view=view)
 
+class PaginatedListView(discord.ui.View):
+    def __init__(self, author, title, description, field_name, lines, page_size=15, format_line=None, prepare_page=None):
+        super().__init__(timeout=300)
+        self.author = author
+        self.title = title
+        self.description = description
+        self.field_name = field_name
+        self.lines = lines
+        # Optional format_line(index, item) renders raw items only when their page is shown
+        self.format_line = format_line
+        # Optional coroutine prepare_page(items) run before a page is rendered, e.g. to resolve users for just that page
+        self.prepare_page = prepare_page
+        self.page_size = page_size
+        self.page = 0
+        self.page_count = -(-len(lines) // page_size)
+        self.update_buttons()
+
+    def get_page_embed(self):
+        """Build the embed for the current page (15 lines per page by default)"""
+        start = self.page * self.page_size
+        chunk = self.lines[start:start + self.page_size]
+        if self.format_line:
+            chunk = [self.format_line(start + i, item) for i, item in enumerate(chunk)]
+        embed = create_embed(f"{self.title} ({start+1}-{start+len(chunk)})", f"{self.description}\nPage {self.page + 1}/{self.page_count}", 0x1a1a1a)
+        add_field(embed, self.field_name, "\n".join(chunk), False)
+        return embed
+
+    async def render_page(self):
+        """Run prepare_page for the current page's items, then build its embed"""
+        if self.prepare_page:
+            start = self.page * self.page_size
+            await self.prepare_page(self.lines[start:start + self.page_size])
+        return self.get_page_embed()
+
+    def update_buttons(self):
+        self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = self.page >= self.page_count - 1
+
+    async def change_page(self, interaction, step):
+        if interaction.user.id != self.author.id:
+            return await interaction.response.send_message("These buttons are only for the person who used the command.", ephemeral=True)
+        self.page = max(0, min(self.page + step, self.page_count - 1))
+        self.update_buttons()
+        if self.prepare_page is None:
+            await interaction.response.edit_message(embed=self.get_page_embed(), view=self)
+            return
+        # prepare_page may fetch users over REST; acknowledge first so the 3 second interaction deadline is not missed
+        await interaction.response.defer()
+        await interaction.edit_original_response(embed=await self.render_page(), view=self)
+
+    @discord.ui.button(label="◀ Previous", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.change_page(interaction, -1)
+
+    @discord.ui.button(label="Next ▶", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.change_page(interaction, 1)
+
 @bot.command(name='list-all')
 @is_admin()
 async def list_all_vps(ctx):
     """List all RathamCloud VPS and user information (Admin only)"""
-    total_vps = 0
     total_users = len(vps_data)
-    running_vps = 0
-    stopped_vps = 0
-    suspended_vps = 0
     
     vps_info = []
     user_summary = []
+    users = await resolve_users(vps_data)
     
     for user_id, vps_list in vps_data.items():
-        try:
-            user = await bot.fetch_user(int(user_id))
-            user_vps_count = len(vps_list)
-            user_running = sum(1 for vps in vps_list if vps.get('status') == 'running' and not vps.get('suspended', False))
-            user_stopped = sum(1 for vps in vps_list if vps.get('status') == 'stopped')
-            user_suspended = sum(1 for vps in vps_list if vps.get('suspended', True))
-            
-            total_vps += user_vps_count
-            running_vps += user_running
-            stopped_vps += user_stopped
-            suspended_vps += user_suspended
-            
-            # User summary
-            user_summary.append(f"**{user.name}** ({user.mention}) - {user_vps_count} RathamCloud VPS ({user_running} running, {user_suspended} suspended)")
-            
-            # Individual VPS details
-            for i, vps in enumerate(vps_list):
-                status_emoji = "🟢" if vps.get('status') == 'running' and not vps.get('suspended', False) else "🟡" if vps.get('suspended', False) else "🔴"
-                status_text = vps.get('status', 'unknown').upper()
-                if vps.get('suspended', False):
-                    status_text += " (SUSPENDED)"
-                vps_info.append(f"{status_emoji} **{user.name}** - VPS {i+1}: `{vps['container_name']}` - {vps.get('config', 'Custom')} - {status_text}")
-                
-        except discord.NotFound:
+        user = users[user_id]
+        if user is None:
             vps_info.append(f"❓ Unknown User ({user_id}) - {len(vps_list)} RathamCloud VPS")
+            continue
+        user_vps_count = len(vps_list)
+        user_running = 0
+        user_suspended = 0
+        
+        # Count states and build the VPS detail lines in one pass
+        for i, vps in enumerate(vps_list):
+            status = vps.get('status', 'unknown')
+            suspended = vps.get('suspended', False)
+            if suspended:
+                user_suspended += 1
+                status_emoji = "🟡"
+            elif status == 'running':
+                user_running += 1
+                status_emoji = "🟢"
+            else:
+                status_emoji = "🔴"
+            status_text = status.upper()
+            if suspended:
+                status_text += " (SUSPENDED)"
+            vps_info.append(f"{status_emoji} **{user.name}** - VPS {i+1}: `{vps['container_name']}` - {vps.get('config', 'Custom')} - {status_text}")
+        
+        # User summary
+        user_summary.append(f"**{user.name}** ({user.mention}) - {user_vps_count} RathamCloud VPS ({user_running} running, {user_suspended} suspended)")
     
     # Create multiple embeds if needed to avoid character limit
     embeds = []
     
     # First embed with overview
     embed = create_embed("All RathamCloud VPS Information", "Complete overview of all RathamCloud VPS deployments and user statistics", 0x1a1a1a)
-    add_field(embed, "System Overview", f"**Total Users:** {total_users}\n**Total VPS:** {total_vps}\n**Running:** {running_vps}\n**Stopped:** {stopped_vps}\n**Suspended:** {suspended_vps}", False)
+    add_field(embed, "System Overview", f"**Total Users:** {total_users}\n**Total VPS:** {len(container_index)}\n**Running:** {resource_totals.states['running']}\n**Stopped:** {resource_totals.states['stopped']}\n**Suspended:** {resource_totals.states['suspended']}", False)
     embeds.append(embed)
     
     # User summary embed
     if user_summary:
         embed = create_embed("RathamCloud User Summary", f"Summary of all users and their RathamCloud VPS", 0x1a1a1a)
         # Split user summary into chunks to avoid character limit
-        for i in range(0, len(user_summary), 10):
-            chunk = user_summary[i:i+10]
-            summary_text = "\n".join(chunk)
-            if i == 0:
-                add_field(embed, "Users", summary_text, False)
-            else:
-                add_field(embed, f"Users (continued {i+1}-{min(i+10, len(user_summary))})", summary_text, False)
+        add_fields(embed, [
+            ("Users" if idx == 0 else f"Users (continued {idx*10+1}-{idx*10+len(chunk)})", "\n".join(chunk), False)
+            for idx, chunk in enumerate(chunked(user_summary, 10))
+        ])
         embeds.append(embed)
     
-    # VPS details embeds
-    if vps_info:
-        # Split VPS info into chunks to avoid character limit
-        for i in range(0, len(vps_info), 15):
-            chunk = vps_info[i:i+15]
-            embed = create_embed(f"RathamCloud VPS Details ({i+1}-{min(i+15, len(vps_info))})", "List of all RathamCloud VPS deployments", 0x1a1a1a)
-            add_field(embed, "VPS List", "\n".join(chunk), False)
-            embeds.append(embed)
-    
     # Send all embeds
     for embed in embeds:
         await ctx.send(embed=embed)
+    
+    # VPS details, one page at a time; later pages are only built when requested
+    if vps_info:
+        view = PaginatedListView(ctx.author, "RathamCloud VPS Details", "List of all RathamCloud VPS deployments", "VPS List", vps_info)
+        await ctx.send(embed=view.get_page_embed(), view=view if view.page_count > 1 else None)
 
 @bot.command(name='manage-shared')
 async def manage_shared_vps(ctx, owner: discord.Member, vps_number: int):
@@ -1268,7 +2198,7 @@ async def manage_shared_vps(ctx, owner: discord.Member, vps_number: int):
         await ctx.send(embed=create_error_embed("Invalid VPS", "Invalid VPS number or owner doesn't have a RathamCloud VPS."))
         return
     vps = vps_data[owner_id][vps_number - 1]
-    if user_id not in vps.get("shared_with", []):
+    if user_id not in vps["shared_with"]:
         await ctx.send(embed=create_error_embed("Access Denied", "You do not have access to this RathamCloud VPS."))
         return
     view = ManageView(user_id, [vps], is_shared=True, owner_id=owner_id)
@@ -1285,14 +2215,11 @@ async def share_user(ctx, shared_user: discord.Member, vps_number: int):
         return
     vps = vps_data[user_id][vps_number - 1]
 
-    if "shared_with" not in vps:
-        vps["shared_with"] = []
-
     if shared_user_id in vps["shared_with"]:
         await ctx.send(embed=create_error_embed("Already Shared", f"{shared_user.mention} already has access to this RathamCloud VPS!"))
         return
-    vps["shared_with"].append(shared_user_id)
-    save_data()
+    vps["shared_with"].add(shared_user_id)
+    mark_dirty()
     await ctx.send(embed=create_success_embed("VPS Shared", f"RathamCloud VPS #{vps_number} shared with {shared_user.mention}!"))
     try:
         await shared_user.send(embed=create_embed("RathamCloud VPS Access Granted", f"You have access to VPS #{vps_number} from {ctx.author.mention}. Use `!manage-shared {ctx.author.mention} {vps_number}`", 0x00ff88))
@@ -1309,14 +2236,11 @@ async def revoke_share(ctx, shared_user: discord.Member, vps_number: int):
         return
     vps = vps_data[user_id][vps_number - 1]
 
-    if "shared_with" not in vps:
-        vps["shared_with"] = []
-
     if shared_user_id not in vps["shared_with"]:
         await ctx.send(embed=create_error_embed("Not Shared", f"{shared_user.mention} doesn't have access to this RathamCloud VPS!"))
         return
-    vps["shared_with"].remove(shared_user_id)
-    save_data()
+    vps["shared_with"].discard(shared_user_id)
+    mark_dirty()
     await ctx.send(embed=create_success_embed("Access Revoked", f"Access to RathamCloud VPS #{vps_number} revoked from {shared_user.mention}!"))
     try:
         await shared_user.send(embed=create_embed("RathamCloud VPS Access Revoked", f"Your access to VPS #{vps_number} by {ctx.author.mention} has been revoked.", 0xff3366))
@@ -1338,24 +2262,22 @@ async def delete_vps(ctx, user: discord.Member, vps_number: int, *, reason: str
     await ctx.send(embed=create_info_embed("Deleting RathamCloud VPS", f"Removing VPS #{vps_number}..."))
 
     try:
-        # Force stop the container before deletion to ensure it's removed cleanly
-        try:
-            await execute_RTC(f"RTC stop {container_name} --force")
-        except Exception:
-            pass # Ignore errors if container is already stopped
-        await execute_RTC(f"RTC delete {container_name} --force")
+        # --force stops a running container as part of the delete, so no separate stop is needed
+        await execute_RTC(["RTC", "delete", container_name, "--force"])
         del vps_data[user_id][vps_number - 1]
+        unindex_vps(container_name)
+        release_container_ports(container_name)
         if not vps_data[user_id]:
             del vps_data[user_id]
             # Remove VPS role if user has no more VPS
             if ctx.guild:
                 vps_role = await get_or_create_vps_role(ctx.guild)
-                if vps_role and vps_role in user.roles:
+                if vps_role and user.get_role(vps_role.id):
                     try:
                         await user.remove_roles(vps_role, reason="No RathamCloud VPS ownership")
                     except discord.Forbidden:
                         logger.warning(f"Failed to remove RathamCloud VPS role from {user.name}")
-        save_data()
+        mark_dirty()
 
         embed = create_success_embed("RathamCloud VPS Deleted Successfully")
         add_field(embed, "Owner", user.mention, True)
@@ -1376,31 +2298,19 @@ async def add_resources(ctx, vps_id: str, ram: int = None, cpu: int = None, disk
         return
     
     # Find the VPS in our database
-    found_vps = None
-    user_id = None
-    vps_index = None
-    
-    for uid, vps_list in vps_data.items():
-        for i, vps in enumerate(vps_list):
-            if vps['container_name'] == vps_id:
-                found_vps = vps
-                user_id = uid
-                vps_index = i
-                break
-        if found_vps:
-            break
+    user_id, found_vps = container_index.get(vps_id, (None, None))
     
     if not found_vps:
         await ctx.send(embed=create_error_embed("VPS Not Found", f"No RathamCloud VPS found with ID: `{vps_id}`"))
         return
     
-    was_running = found_vps.get('status') == 'running' and not found_vps.get('suspended', False)
+    was_running = found_vps['status'] == 'running' and not found_vps['suspended']
     if was_running:
         await ctx.send(embed=create_info_embed("Stopping VPS", f"Stopping RathamCloud VPS `{vps_id}` to apply resource changes..."))
         try:
-            await execute_RTC(f"RTC stop {vps_id}")
-            found_vps['status'] = 'stopped'
-            save_data()
+            await execute_RTC(["RTC", "stop", vps_id])
+            set_vps_state(found_vps, status='stopped')
+            mark_dirty()
         except Exception as e:
             await ctx.send(embed=create_error_embed("Stop Failed", f"Error stopping VPS: {str(e)}"))
             return
@@ -1408,48 +2318,48 @@ async def add_resources(ctx, vps_id: str, ram: int = None, cpu: int = None, disk
     changes = []
     
     try:
-        current_ram_gb = int(found_vps['ram'].replace('GB', ''))
-        current_cpu = int(found_vps['cpu'])
-        current_disk_gb = int(found_vps['storage'].replace('GB', ''))
+        current_ram_gb = found_vps['ram_gb']
+        current_cpu = found_vps['cpu']
+        current_disk_gb = found_vps['disk_gb']
         
         new_ram_gb = current_ram_gb
         new_cpu = current_cpu
         new_disk_gb = current_disk_gb
         
+        ram_mb = cpu_limit = disk_gb = None
+        
         # Add RAM if specified
         if ram is not None and ram > 0:
             new_ram_gb += ram
             ram_mb = new_ram_gb * 1024
-            await execute_RTC(f"RTC config set {vps_id} limits.memory {ram_mb}MB")
             changes.append(f"RAM: +{ram}GB (New total: {new_ram_gb}GB)")
         
         # Add CPU if specified
         if cpu is not None and cpu > 0:
             new_cpu += cpu
-            await execute_RTC(f"RTC config set {vps_id} limits.cpu {new_cpu}")
+            cpu_limit = new_cpu
             changes.append(f"CPU: +{cpu} cores (New total: {new_cpu} cores)")
         
         # Add disk if specified
         if disk is not None and disk > 0:
             new_disk_gb += disk
-            await execute_RTC(f"RTC config device set {vps_id} root size {new_disk_gb}GB")
+            disk_gb = new_disk_gb
             changes.append(f"Disk: +{disk}GB (New total: {new_disk_gb}GB)")
         
+        await apply_resource_limits(vps_id, ram_mb, cpu_limit, disk_gb)
+        
         # Update VPS data
-        found_vps['ram'] = f"{new_ram_gb}GB"
-        found_vps['cpu'] = str(new_cpu)
-        found_vps['storage'] = f"{new_disk_gb}GB"
+        set_vps_resources(found_vps, new_ram_gb, new_cpu, new_disk_gb)
         found_vps['config'] = f"{new_ram_gb}GB RAM / {new_cpu} CPU / {new_disk_gb}GB Disk"
         
         # Save changes to database
-        vps_data[user_id][vps_index] = found_vps
-        save_data()
+        mark_dirty()
         
         # Start the VPS if it was running before
         if was_running:
-            await execute_RTC(f"RTC start {vps_id}")
-            found_vps['status'] = 'running'
-            save_data()
+            await execute_RTC(["RTC", "start", vps_id])
+            set_vps_state(found_vps, status='running')
+            mark_dirty()
         
         embed = create_success_embed("Resources Added", f"Successfully added resources to RathamCloud VPS `{vps_id}`")
         add_field(embed, "Changes Applied", "\n".join(changes), False)
@@ -1463,7 +2373,7 @@ async def add_resources(ctx, vps_id: str, ram: int = None, cpu: int = None, disk
 async def admin_add(ctx, user: discord.Member):
     """Add RathamCloud admin (Main admin only)"""
     user_id = str(user.id)
-    if user_id == str(MAIN_ADMIN_ID):
+    if user_id == MAIN_ADMIN_STR:
         await ctx.send(embed=create_error_embed("Already Admin", "This user is already the main RathamCloud admin!"))
         return
 
@@ -1471,11 +2381,9 @@ async def admin_add(ctx, user: discord.Member):
         await ctx.send(embed=create_error_embed("Already Admin", f"{user.mention} is already a RathamCloud admin!"))
         return
 
-    if "admins" not in admin_data:
-        admin_data["admins"] = []
-
-    admin_data["admins"].append(user_id)
-    save_data()
+    admin_data["admins"].add(user_id)
+    admin_ids.add(user_id)
+    mark_dirty()
     await ctx.send(embed=create_success_embed("Admin Added", f"{user.mention} is now a RathamCloud admin!"))
     try:
         await user.send(embed=create_embed("🎉 RathamCloud Admin Role Granted", f"You are now a RathamCloud admin by {ctx.author.mention}", 0x00ff88))
@@ -1487,7 +2395,7 @@ async def admin_add(ctx, user: discord.Member):
 async def admin_remove(ctx, user: discord.Member):
     """Remove RathamCloud admin (Main admin only)"""
     user_id = str(user.id)
-    if user_id == str(MAIN_ADMIN_ID):
+    if user_id == MAIN_ADMIN_STR:
         await ctx.send(embed=create_error_embed("Cannot Remove", "You cannot remove the main RathamCloud admin!"))
         return
 
@@ -1495,8 +2403,9 @@ async def admin_remove(ctx, user: discord.Member):
         await ctx.send(embed=create_error_embed("Not Admin", f"{user.mention} is not a RathamCloud admin!"))
         return
 
-    admin_data["admins"].remove(user_id)
-    save_data()
+    admin_data["admins"].discard(user_id)
+    admin_ids.discard(user_id)
+    mark_dirty()
     await ctx.send(embed=create_success_embed("Admin Removed", f"{user.mention} is no longer a RathamCloud admin!"))
     try:
         await user.send(embed=create_embed("⚠️ RathamCloud Admin Role Revoked", f"Your admin role was removed by {ctx.author.mention}", 0xff3366))
@@ -1507,8 +2416,8 @@ async def admin_remove(ctx, user: discord.Member):
 @is_main_admin()
 async def admin_list(ctx):
     """List all RathamCloud admins (Main admin only)"""
-    admins = admin_data.get("admins", [])
-    main_admin = await bot.fetch_user(MAIN_ADMIN_ID)
+    admins = sorted(admin_data["admins"])
+    main_admin = await resolve_user(MAIN_ADMIN_ID)
 
     embed = create_embed("👑 RathamCloud Admin Team", "Current RathamCloud administrators:", 0x1a1a1a)
     add_field(embed, "🔰 Main Admin", f"{main_admin.mention} (ID: {MAIN_ADMIN_ID})", False)
@@ -1517,7 +2426,7 @@ async def admin_list(ctx):
         admin_list = []
         for admin_id in admins:
             try:
-                admin_user = await bot.fetch_user(int(admin_id))
+                admin_user = await resolve_user(admin_id)
                 admin_list.append(f"• {admin_user.mention} (ID: {admin_id})")
             except:
                 admin_list.append(f"• Unknown User (ID: {admin_id})")
@@ -1545,55 +2454,34 @@ async def user_info(ctx, user: discord.Member):
 
     # VPS info
     if vps_list:
-        vps_info = []
-        total_ram = 0
-        total_cpu = 0
-        total_storage = 0
-        running_count = 0
-        suspended_count = 0
-
-        for i, vps in enumerate(vps_list):
-            status_emoji = "🟢" if vps.get('status') == 'running' and not vps.get('suspended', False) else "🟡" if vps.get('suspended', False) else "🔴"
-            status_text = vps.get('status', 'unknown').upper()
-            if vps.get('suspended', False):
+        def vps_line(i, vps):
+            status = vps.get('status', 'unknown')
+            suspended = vps.get('suspended', False)
+            status_emoji = "🟢" if status == 'running' and not suspended else "🟡" if suspended else "🔴"
+            status_text = status.upper()
+            if suspended:
                 status_text += " (SUSPENDED)"
-                suspended_count += 1
-            else:
-                running_count += 1 if vps.get('status') == 'running' else 0
-            vps_info.append(f"{status_emoji} VPS {i+1}: `{vps['container_name']}` - {status_text}")
-
-            # Calculate totals
-            ram_gb = int(vps['ram'].replace('GB', ''))
-            storage_gb = int(vps['storage'].replace('GB', ''))
-            total_ram += ram_gb
-            total_cpu += int(vps['cpu'])
-            total_storage += storage_gb
+            return f"{status_emoji} VPS {i+1}: `{vps['container_name']}` - {status_text}"
 
-        vps_summary = f"**Total VPS:** {len(vps_list)}\n**Running:** {running_count}\n**Suspended:** {suspended_count}\n**Total RAM:** {total_ram}GB\n**Total CPU:** {total_cpu} cores\n**Total Storage:** {total_storage}GB"
+        # Totals come from the running per-user counters
+        totals = user_totals.get(user_id, ResourceTotals())
+        vps_summary = f"**Total VPS:** {len(vps_list)}\n**Running:** {totals.states['running']}\n**Suspended:** {totals.states['suspended']}\n**Total RAM:** {totals.ram_gb}GB\n**Total CPU:** {totals.cpu} cores\n**Total Storage:** {totals.disk_gb}GB"
         add_field(embed, "🖥️ RathamCloud VPS Information", vps_summary, False)
         
-        # Create additional embeds if VPS list is too long
-        if len(vps_info) > 10:
-            # First embed with first 10 VPS
-            first_embed = embed
-            add_field(first_embed, "📋 VPS List (1-10)", "\n".join(vps_info[:10]), False)
-            await ctx.send(embed=first_embed)
-            
-            # Additional embeds for remaining VPS
-            for i in range(10, len(vps_info), 10):
-                chunk = vps_info[i:i+10]
-                additional_embed = create_embed(f"RathamCloud VPS List ({i+1}-{min(i+10, len(vps_info))})", f"More VPS for {user.mention}", 0x1a1a1a)
-                add_field(additional_embed, "📋 VPS List", "\n".join(chunk), False)
-                await ctx.send(embed=additional_embed)
+        # Long VPS lists get their own paged message; lines are only formatted for the page on screen
+        if len(vps_list) > 10:
+            await ctx.send(embed=embed)
+            view = PaginatedListView(ctx.author, "RathamCloud VPS List", f"VPS owned by {user.mention}", "📋 VPS List", vps_list, page_size=10, format_line=vps_line)
+            await ctx.send(embed=view.get_page_embed(), view=view)
         else:
-            add_field(embed, "📋 VPS List", "\n".join(vps_info), False)
+            add_field(embed, "📋 VPS List", "\n".join(vps_line(i, vps) for i, vps in enumerate(vps_list)), False)
             await ctx.send(embed=embed)
     else:
         add_field(embed, "🖥️ RathamCloud VPS Information", "**No VPS owned**", False)
         await ctx.send(embed=embed)
 
     # Check if user is admin
-    is_admin_user = user_id == str(MAIN_ADMIN_ID) or user_id in admin_data.get("admins", [])
+    is_admin_user = user_id in admin_ids
     add_field(embed, "🛡️ RathamCloud Admin Status", f"**{'Yes' if is_admin_user else 'No'}**", False)
 
 @bot.command(name='serverstats')
@@ -1601,27 +2489,14 @@ async def user_info(ctx, user: discord.Member):
 async def server_stats(ctx):
     """Show RathamCloud server statistics (Admin only)"""
     total_users = len(vps_data)
-    total_vps = sum(len(vps_list) for vps_list in vps_data.values())
-
-    # Calculate resources
-    total_ram = 0
-    total_cpu = 0
-    total_storage = 0
-    running_vps = 0
-    suspended_vps = 0
-
-    for vps_list in vps_data.values():
-        for vps in vps_list:
-            ram_gb = int(vps['ram'].replace('GB', ''))
-            storage_gb = int(vps['storage'].replace('GB', ''))
-            total_ram += ram_gb
-            total_cpu += int(vps['cpu'])
-            total_storage += storage_gb
-            if vps.get('status') == 'running':
-                if vps.get('suspended', False):
-                    suspended_vps += 1
-                else:
-                    running_vps += 1
+    total_vps = len(container_index)
+
+    # Served from the running counters instead of a scan over every VPS
+    total_ram = resource_totals.ram_gb
+    total_cpu = resource_totals.cpu
+    total_storage = resource_totals.disk_gb
+    running_vps = resource_totals.states['running']
+    suspended_vps = resource_totals.states['suspended']
 
     embed = create_embed("📊 RathamCloud Server Statistics", "Current RathamCloud server overview", 0x1a1a1a)
     add_field(embed, "👥 Users", f"**Total Users:** {total_users}\n**Total Admins:** {len(admin_data.get('admins', [])) + 1}", False)
@@ -1635,43 +2510,38 @@ async def server_stats(ctx):
 async def vps_info(ctx, container_name: str = None):
     """Get detailed RathamCloud VPS information (Admin only)"""
     if not container_name:
-        # Show all VPS
-        all_vps = []
-        for user_id, vps_list in vps_data.items():
-            try:
-                user = await bot.fetch_user(int(user_id))
-                for i, vps in enumerate(vps_list):
-                    status_text = vps.get('status', 'unknown').upper()
-                    if vps.get('suspended', False):
-                        status_text += " (SUSPENDED)"
-                    all_vps.append(f"**{user.name}** - RathamCloud VPS {i+1}: `{vps['container_name']}` - {status_text}")
-            except:
-                pass
+        # Show all VPS, 20 per page; owners are resolved only for the page being shown
+        rows = [(user_id, i, vps) for user_id, vps_list in vps_data.items() for i, vps in enumerate(vps_list)]
+        if not rows:
+            await ctx.send(embed=create_info_embed("No VPS", "There are no RathamCloud VPS deployments yet."))
+            return
 
-        # Create multiple embeds if needed to avoid character limit
-        for i in range(0, len(all_vps), 20):
-            chunk = all_vps[i:i+20]
-            embed = create_embed(f"🖥️ All RathamCloud VPS ({i+1}-{min(i+20, len(all_vps))})", f"List of all RathamCloud VPS deployments", 0x1a1a1a)
-            add_field(embed, "VPS List", "\n".join(chunk), False)
-            await ctx.send(embed=embed)
+        page_users = {}
+
+        async def resolve_page(page_rows):
+            page_users.update(await resolve_users({user_id for user_id, _, _ in page_rows} - page_users.keys()))
+
+        def vps_line(_, row):
+            user_id, i, vps = row
+            user = page_users.get(user_id)
+            owner = user.name if user else f"Unknown User ({user_id})"
+            status_text = vps.get('status', 'unknown').upper()
+            if vps.get('suspended', False):
+                status_text += " (SUSPENDED)"
+            return f"**{owner}** - RathamCloud VPS {i+1}: `{vps['container_name']}` - {status_text}"
+
+        view = PaginatedListView(ctx.author, "🖥️ All RathamCloud VPS", "List of all RathamCloud VPS deployments", "VPS List", rows, page_size=20, format_line=vps_line, prepare_page=resolve_page)
+        await ctx.send(embed=await view.render_page(), view=view if view.page_count > 1 else None)
     else:
         # Show specific VPS info
-        found_vps = None
-        found_user = None
-
-        for user_id, vps_list in vps_data.items():
-            for vps in vps_list:
-                if vps['container_name'] == container_name:
-                    found_vps = vps
-                    found_user = await bot.fetch_user(int(user_id))
-                    break
-            if found_vps:
-                break
+        user_id, found_vps = container_index.get(container_name, (None, None))
 
         if not found_vps:
             await ctx.send(embed=create_error_embed("VPS Not Found", f"No RathamCloud VPS found with container name: `{container_name}`"))
             return
 
+        found_user = await resolve_user(user_id)
+
         suspended_text = " (SUSPENDED)" if found_vps.get('suspended', False) else ""
         embed = create_embed(f"🖥️ RathamCloud VPS Information - {container_name}", f"Details for VPS owned by {found_user.mention}{suspended_text}", 0x1a1a1a)
         add_field(embed, "👤 Owner", f"**Name:** {found_user.name}\n**ID:** {found_user.id}", False)
@@ -1683,11 +2553,10 @@ async def vps_info(ctx, container_name: str = None):
 
         if found_vps.get('shared_with'):
             shared_users = []
-            for shared_id in found_vps['shared_with']:
-                try:
-                    shared_user = await bot.fetch_user(int(shared_id))
+            for shared_id, shared_user in (await resolve_users(found_vps['shared_with'])).items():
+                if shared_user is not None:
                     shared_users.append(f"• {shared_user.mention}")
-                except:
+                else:
                     shared_users.append(f"• Unknown User ({shared_id})")
             shared_text = "\n".join(shared_users)
             add_field(embed, "🔗 Shared With", shared_text, False)
@@ -1701,16 +2570,13 @@ async def restart_vps(ctx, container_name: str):
     await ctx.send(embed=create_info_embed("Restarting VPS", f"Restarting RathamCloud VPS `{container_name}`..."))
 
     try:
-        await execute_RTC(f"RTC restart {container_name}")
+        await execute_RTC(["RTC", "restart", container_name])
 
         # Update status in database
-        for user_id, vps_list in vps_data.items():
-            for vps in vps_list:
-                if vps['container_name'] == container_name:
-                    vps['status'] = 'running'
-                    vps['suspended'] = False
-                    save_data()
-                    break
+        entry = container_index.get(container_name)
+        if entry:
+            set_vps_state(entry[1], status='running', suspended=False)
+            mark_dirty()
 
         await ctx.send(embed=create_success_embed("VPS Restarted", f"RathamCloud VPS `{container_name}` has been restarted successfully!"))
 
@@ -1726,7 +2592,7 @@ async def backup_vps(ctx, container_name: str):
     await ctx.send(embed=create_info_embed("Creating RathamCloud Backup", f"Creating snapshot of `{container_name}`..."))
 
     try:
-        await execute_RTC(f"RTC snapshot {container_name} {snapshot_name}")
+        await execute_RTC(["RTC", "snapshot", container_name, snapshot_name])
         await ctx.send(embed=create_success_embed("Backup Created", f"RathamCloud Snapshot `{snapshot_name}` created successfully!"))
 
     except Exception as e:
@@ -1739,7 +2605,7 @@ async def restore_vps(ctx, container_name: str, snapshot_name: str):
     await ctx.send(embed=create_info_embed("Restoring VPS", f"Restoring `{container_name}` from RathamCloud snapshot `{snapshot_name}`..."))
 
     try:
-        await execute_RTC(f"RTC restore {container_name} {snapshot_name}")
+        await execute_RTC(["RTC", "restore", container_name, snapshot_name])
         await ctx.send(embed=create_success_embed("VPS Restored", f"RathamCloud VPS `{container_name}` has been restored from snapshot!"))
 
     except Exception as e:
@@ -1750,18 +2616,12 @@ async def restore_vps(ctx, container_name: str, snapshot_name: str):
 async def list_snapshots(ctx, container_name: str):
     """List all snapshots for a RathamCloud VPS (Admin only)"""
     try:
-        # Improved parsing for RTC list --type snapshot
-        proc = await asyncio.create_subprocess_exec(
-            RTC_EXECUTABLE, "list", "--type", "snapshot", "--columns", "n",
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        stdout, stderr = await proc.communicate()
-        if proc.returncode != 0:
-            raise Exception(stderr.decode())
+        # Ask LXD's API for this instance's snapshots only; recursion=1 returns snapshot objects, not URLs
+        returncode, stdout, stderr = await run_RTC_listing(["RTC", "query", f"/1.0/instances/{quote(container_name, safe='')}/snapshots?recursion=1"])
+        if returncode != 0:
+            raise Exception(stderr or "Command failed with no error output")
 
-        snapshots = [line.strip() for line in stdout.decode().splitlines() if line.strip() and container_name in line]
-        snapshots = [snap.split()[0] for snap in snapshots if snap]  # Extract names
+        snapshots = [snap['name'] for snap in orjson.loads(stdout or "[]")]
 
         if snapshots:
             # Create multiple embeds if needed to avoid character limit
@@ -1776,6 +2636,9 @@ async def list_snapshots(ctx, container_name: str):
     except Exception as e:
         await ctx.send(embed=create_error_embed("Error", f"Error listing snapshots: {str(e)}"))
 
+# Bytes of !exec stdout/stderr kept for display
+EXEC_OUTPUT_CAP = 1000
+
 @bot.command(name='exec')
 @is_admin()
 async def execute_command(ctx, container_name: str, *, command: str):
@@ -1788,22 +2651,26 @@ async def execute_command(ctx, container_name: str, *, command: str):
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE
         )
-        stdout, stderr = await proc.communicate()
+        # Only the first EXEC_OUTPUT_CAP bytes of each stream are shown, so the rest is drained without being kept
+        (stdout, stdout_truncated), (stderr, stderr_truncated) = await asyncio.gather(
+            read_capped(proc.stdout, EXEC_OUTPUT_CAP),
+            read_capped(proc.stderr, EXEC_OUTPUT_CAP),
+        )
+        await proc.wait()
 
-        output = stdout.decode() if stdout else "No output"
-        error = stderr.decode() if stderr else ""
+        output = stdout.decode(errors="replace") if stdout else "No output"
+        error = stderr.decode(errors="replace") if stderr else ""
 
         embed = create_embed(f"Command Output - {container_name}", f"Command: `{command}`", 0x1a1a1a)
 
         if output.strip():
-            # Split output if too long
-            if len(output) > 1000:
-                output = output[:1000] + "\n... (truncated)"
+            if stdout_truncated:
+                output += "\n... (truncated)"
             add_field(embed, "📤 Output", f"```\n{output}\n```", False)
 
         if error.strip():
-            if len(error) > 1000:
-                error = error[:1000] + "\n... (truncated)"
+            if stderr_truncated:
+                error += "\n... (truncated)"
             add_field(embed, "⚠️ Error", f"```\n{error}\n```", False)
 
         add_field(embed, "🔄 Exit Code", f"**{proc.returncode}**", False)
@@ -1813,59 +2680,53 @@ async def execute_command(ctx, container_name: str, *, command: str):
     except Exception as e:
         await ctx.send(embed=create_error_embed("Execution Failed", f"Error: {str(e)}"))
 
-@bot.command(name='stop-vps-all')
-@is_admin()
-async def stop_all_vps(ctx):
-    """Stop all RathamCloud VPS using RTC stop --all --force (Admin only)"""
-    await ctx.send(embed=create_warning_embed("Stopping All RathamCloud VPS", "⚠️ **WARNING:** This will stop ALL running VPS on the RathamCloud server.\n\nThis action cannot be undone. Continue?"))
-
-    class ConfirmView(discord.ui.View):
-        def __init__(self):
-            super().__init__(timeout=60)
-
-        @discord.ui.button(label="Stop All VPS", style=discord.ButtonStyle.danger)
-        async def confirm(self, interaction: discord.Interaction, item: discord.ui.Button):
-            await interaction.response.defer()
+class ConfirmStopAllView(discord.ui.View):
+    def __init__(self):
+        super().__init__(timeout=60)
 
-            try:
-                # Execute the RTC stop --all --force command
-                proc = await asyncio.create_subprocess_exec(
-                    RTC_EXECUTABLE, "stop", "--all", "--force",
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-                stdout, stderr = await proc.communicate()
-
-                if proc.returncode == 0:
-                    # Update all VPS status in database to stopped
-                    stopped_count = 0
-                    for user_id, vps_list in vps_data.items():
-                        for vps in vps_list:
-                            if vps.get('status') == 'running':
-                                vps['status'] = 'stopped'
-                                vps['suspended'] = False
-                                stopped_count += 1
-
-                    save_data()
-
-                    embed = create_success_embed("All RathamCloud VPS Stopped", f"Successfully stopped {stopped_count} VPS using `RTC stop --all --force`")
-                    output_text = stdout.decode() if stdout else 'No output'
-                    add_field(embed, "Command Output", f"```\n{output_text}\n```", False)
-                    await interaction.followup.send(embed=embed)
-                else:
-                    error_msg = stderr.decode() if stderr else "Unknown error"
-                    embed = create_error_embed("Stop Failed", f"Failed to stop RathamCloud VPS: {error_msg}")
-                    await interaction.followup.send(embed=embed)
+    @discord.ui.button(label="Stop All VPS", style=discord.ButtonStyle.danger)
+    async def confirm(self, interaction: discord.Interaction, item: discord.ui.Button):
+        await interaction.response.defer()
 
-            except Exception as e:
-                embed = create_error_embed("Error", f"Error stopping VPS: {str(e)}")
+        try:
+            # Execute the RTC stop --all --force command
+            returncode, stdout, stderr = await run_RTC(["RTC", "stop", "--all", "--force"], timeout=600)
+            invalidate_container_stats()
+            rtc_shell_pool.close_all()
+
+            if returncode == 0:
+                # Update all VPS status in database to stopped
+                stopped_count = 0
+                for _, vps in container_index.values():
+                    if vps['status'] == 'running':
+                        set_vps_state(vps, status='stopped', suspended=False)
+                        stopped_count += 1
+
+                mark_dirty()
+
+                embed = create_success_embed("All RathamCloud VPS Stopped", f"Successfully stopped {stopped_count} VPS using `RTC stop --all --force`")
+                output_text = stdout or 'No output'
+                add_field(embed, "Command Output", f"```\n{output_text}\n```", False)
+                await interaction.followup.send(embed=embed)
+            else:
+                error_msg = stderr or "Unknown error"
+                embed = create_error_embed("Stop Failed", f"Failed to stop RathamCloud VPS: {error_msg}")
                 await interaction.followup.send(embed=embed)
 
-        @discord.ui.button(label="Cancel", style=discord.ButtonStyle.secondary)
-        async def cancel(self, interaction: discord.Interaction, item: discord.ui.Button):
-            await interaction.response.edit_message(embed=create_info_embed("Operation Cancelled", "The stop all RathamCloud VPS operation has been cancelled."))
+        except Exception as e:
+            embed = create_error_embed("Error", f"Error stopping VPS: {str(e)}")
+            await interaction.followup.send(embed=embed)
+
+    @discord.ui.button(label="Cancel", style=discord.ButtonStyle.secondary)
+    async def cancel(self, interaction: discord.Interaction, item: discord.ui.Button):
+        await interaction.response.edit_message(embed=create_info_embed("Operation Cancelled", "The stop all RathamCloud VPS operation has been cancelled."))
 
-    await ctx.send(view=ConfirmView())
+@bot.command(name='stop-vps-all')
+@is_admin()
+async def stop_all_vps(ctx):
+    """Stop all RathamCloud VPS using RTC stop --all --force (Admin only)"""
+    await ctx.send(embed=create_warning_embed("Stopping All RathamCloud VPS", "⚠️ **WARNING:** This will stop ALL running VPS on the RathamCloud server.\n\nThis action cannot be undone. Continue?"))
+    await ctx.send(view=ConfirmStopAllView())
 
 @bot.command(name='cpu-monitor')
 @is_admin()
@@ -1877,7 +2738,7 @@ async def cpu_monitor_control(ctx, action: str = "status"):
         status = "Active" if cpu_monitor_active else "Inactive"
         embed = create_embed("RathamCloud CPU Monitor Status", f"RathamCloud CPU monitoring is currently **{status}**", 0x00ccff if cpu_monitor_active else 0xffaa00)
         add_field(embed, "Threshold", f"{CPU_THRESHOLD}% CPU usage", True)
-        add_field(embed, "Check Interval", f"60 seconds (host)", True)
+        add_field(embed, "Check Interval", f"{HOST_CPU_INTERVAL} seconds (host)", True)
         await ctx.send(embed=embed)
     elif action.lower() == "enable":
         cpu_monitor_active = True
@@ -1897,31 +2758,19 @@ async def resize_vps(ctx, container_name: str, ram: int = None, cpu: int = None,
         return
     
     # Find the VPS in our database
-    found_vps = None
-    user_id = None
-    vps_index = None
-    
-    for uid, vps_list in vps_data.items():
-        for i, vps in enumerate(vps_list):
-            if vps['container_name'] == container_name:
-                found_vps = vps
-                user_id = uid
-                vps_index = i
-                break
-        if found_vps:
-            break
+    user_id, found_vps = container_index.get(container_name, (None, None))
     
     if not found_vps:
         await ctx.send(embed=create_error_embed("VPS Not Found", f"No RathamCloud VPS found with container name: `{container_name}`"))
         return
     
-    was_running = found_vps.get('status') == 'running' and not found_vps.get('suspended', False)
+    was_running = found_vps['status'] == 'running' and not found_vps['suspended']
     if was_running:
         await ctx.send(embed=create_info_embed("Stopping VPS", f"Stopping RathamCloud VPS `{container_name}` to apply resource changes..."))
         try:
-            await execute_RTC(f"RTC stop {container_name}")
-            found_vps['status'] = 'stopped'
-            save_data()
+            await execute_RTC(["RTC", "stop", container_name])
+            set_vps_state(found_vps, status='stopped')
+            mark_dirty()
         except Exception as e:
             await ctx.send(embed=create_error_embed("Stop Failed", f"Error stopping VPS: {str(e)}"))
             return
@@ -1929,44 +2778,42 @@ async def resize_vps(ctx, container_name: str, ram: int = None, cpu: int = None,
     changes = []
     
     try:
-        new_ram = int(found_vps['ram'].replace('GB', ''))
-        new_cpu = int(found_vps['cpu'])
-        new_disk = int(found_vps['storage'].replace('GB', ''))
+        new_ram = found_vps['ram_gb']
+        new_cpu = found_vps['cpu']
+        new_disk = found_vps['disk_gb']
+        
+        ram_mb = cpu_limit = disk_gb = None
         
         # Resize RAM if specified
         if ram is not None and ram > 0:
             new_ram = ram
             ram_mb = ram * 1024
-            await execute_RTC(f"RTC config set {container_name} limits.memory {ram_mb}MB")
             changes.append(f"RAM: {ram}GB")
         
         # Resize CPU if specified
         if cpu is not None and cpu > 0:
-            new_cpu = cpu
-            await execute_RTC(f"RTC config set {container_name} limits.cpu {cpu}")
+            new_cpu = cpu_limit = cpu
             changes.append(f"CPU: {cpu} cores")
         
         # Resize disk if specified
         if disk is not None and disk > 0:
-            new_disk = disk
-            await execute_RTC(f"RTC config device set {container_name} root size {disk}GB")
+            new_disk = disk_gb = disk
             changes.append(f"Disk: {disk}GB")
         
+        await apply_resource_limits(container_name, ram_mb, cpu_limit, disk_gb)
+        
         # Update VPS data
-        found_vps['ram'] = f"{new_ram}GB"
-        found_vps['cpu'] = str(new_cpu)
-        found_vps['storage'] = f"{new_disk}GB"
+        set_vps_resources(found_vps, new_ram, new_cpu, new_disk)
         found_vps['config'] = f"{new_ram}GB RAM / {new_cpu} CPU / {new_disk}GB Disk"
         
         # Save changes to database
-        vps_data[user_id][vps_index] = found_vps
-        save_data()
+        mark_dirty()
         
         # Start the VPS if it was running before
         if was_running:
-            await execute_RTC(f"RTC start {container_name}")
-            found_vps['status'] = 'running'
-            save_data()
+            await execute_RTC(["RTC", "start", container_name])
+            set_vps_state(found_vps, status='running')
+            mark_dirty()
         
         embed = create_success_embed("VPS Resized", f"Successfully resized resources for RathamCloud VPS `{container_name}`")
         add_field(embed, "Changes Applied", "\n".join(changes), False)
@@ -1988,42 +2835,30 @@ async def clone_vps(ctx, container_name: str, new_name: str = None):
     
     try:
         # Find the original VPS in our database
-        found_vps = None
-        user_id = None
-        
-        for uid, vps_list in vps_data.items():
-            for vps in vps_list:
-                if vps['container_name'] == container_name:
-                    found_vps = vps
-                    user_id = uid
-                    break
-            if found_vps:
-                break
+        user_id, found_vps = container_index.get(container_name, (None, None))
         
         if not found_vps:
             await ctx.send(embed=create_error_embed("VPS Not Found", f"No RathamCloud VPS found with container name: `{container_name}`"))
             return
         
         # Clone the container
-        await execute_RTC(f"RTC copy {container_name} {new_name}")
+        await execute_RTC(["RTC", "copy", container_name, new_name])
         
         # Start the new container
-        await execute_RTC(f"RTC start {new_name}")
+        await execute_RTC(["RTC", "start", new_name])
         
         # Create a new VPS entry in the database
-        if user_id not in vps_data:
-            vps_data[user_id] = []
-        
         new_vps = found_vps.copy()
         new_vps['container_name'] = new_name
         new_vps['status'] = 'running'
         new_vps['suspended'] = False
         new_vps['suspension_history'] = []
         new_vps['created_at'] = datetime.now().isoformat()
-        new_vps['shared_with'] = []
+        new_vps['shared_with'] = set()
         
-        vps_data[user_id].append(new_vps)
-        save_data()
+        vps_data.setdefault(user_id, []).append(new_vps)
+        index_vps(user_id, new_vps)
+        mark_dirty()
         
         embed = create_success_embed("VPS Cloned", f"Successfully cloned RathamCloud VPS `{container_name}` to `{new_name}`")
         add_field(embed, "New VPS Details", f"**RAM:** {new_vps['ram']}\n**CPU:** {new_vps['cpu']} Cores\n**Storage:** {new_vps['storage']}", False)
@@ -2040,31 +2875,28 @@ async def migrate_vps(ctx, container_name: str, target_pool: str):
     
     try:
         # Stop the container first
-        await execute_RTC(f"RTC stop {container_name}")
+        await execute_RTC(["RTC", "stop", container_name])
         
         # Create a temporary name for migration
         temp_name = f"RathamCloud-{container_name}-temp-{int(time.time())}"
         
         # Copy to new pool with temp name
-        await execute_RTC(f"RTC copy {container_name} {temp_name} --storage {target_pool}")
+        await execute_RTC(["RTC", "copy", container_name, temp_name, "--storage", target_pool])
         
         # Delete the old container
-        await execute_RTC(f"RTC delete {container_name} --force")
+        await execute_RTC(["RTC", "delete", container_name, "--force"])
         
         # Rename temp to original name
-        await execute_RTC(f"RTC rename {temp_name} {container_name}")
+        await execute_RTC(["RTC", "rename", temp_name, container_name])
         
         # Start the container again
-        await execute_RTC(f"RTC start {container_name}")
+        await execute_RTC(["RTC", "start", container_name])
         
         # Update status in database
-        for user_id, vps_list in vps_data.items():
-            for vps in vps_list:
-                if vps['container_name'] == container_name:
-                    vps['status'] = 'running'
-                    vps['suspended'] = False
-                    save_data()
-                    break
+        entry = container_index.get(container_name)
+        if entry:
+            set_vps_state(entry[1], status='running', suspended=False)
+            mark_dirty()
         
         await ctx.send(embed=create_success_embed("VPS Migrated", f"Successfully migrated RathamCloud VPS `{container_name}` to storage pool `{target_pool}`"))
         
@@ -2078,10 +2910,10 @@ async def vps_stats(ctx, container_name: str):
     await ctx.send(embed=create_info_embed("Gathering Statistics", f"Collecting statistics for RathamCloud VPS `{container_name}`..."))
     
     try:
-        status = await get_container_status(container_name)
-        cpu_usage = await get_container_cpu(container_name)
-        memory_usage = await get_container_memory(container_name)
-        disk_usage = await get_container_disk(container_name)
+        status, stats = await asyncio.gather(get_container_status(container_name), get_container_stats(container_name))
+        cpu_usage = stats.cpu_text
+        memory_usage = stats.ram_text
+        disk_usage = stats.disk_text
         network_usage = "N/A"  # Simplified for now
         
         # Create embed with statistics
@@ -2093,14 +2925,7 @@ async def vps_stats(ctx, container_name: str):
         add_field(embed, "🌐 Network Usage", f"**{network_usage}**", False)
         
         # Find the VPS in our database
-        found_vps = None
-        for vps_list in vps_data.values():
-            for vps in vps_list:
-                if vps['container_name'] == container_name:
-                    found_vps = vps
-                    break
-            if found_vps:
-                break
+        _, found_vps = container_index.get(container_name, (None, None))
         
         if found_vps:
             suspended_text = " (SUSPENDED)" if found_vps.get('suspended', False) else ""
@@ -2124,15 +2949,9 @@ async def vps_network(ctx, container_name: str, action: str, value: str = None):
     try:
         if action.lower() == "list":
             # List network interfaces
-            proc = await asyncio.create_subprocess_exec(
-                RTC_EXECUTABLE, "exec", container_name, "--", "ip", "addr",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            stdout, stderr = await proc.communicate()
+            returncode, output = await rtc_shell_pool.run(container_name, ["ip", "addr"], limit=DIAGNOSTIC_OUTPUT_CAP)
             
-            if proc.returncode == 0:
-                output = stdout.decode()
+            if returncode == 0:
                 # Split output if too long
                 if len(output) > 1000:
                     output = output[:1000] + "\n... (truncated)"
@@ -2141,12 +2960,12 @@ async def vps_network(ctx, container_name: str, action: str, value: str = None):
                 add_field(embed, "Interfaces", f"```\n{output}\n```", False)
                 await ctx.send(embed=embed)
             else:
-                await ctx.send(embed=create_error_embed("Error", f"Failed to list network interfaces: {stderr.decode()}"))
+                await ctx.send(embed=create_error_embed("Error", f"Failed to list network interfaces: {output}"))
         
         elif action.lower() == "limit" and value:
             # Set network limit
-            await execute_RTC(f"RTC config device set {container_name} eth0 limits.egress {value}")
-            await execute_RTC(f"RTC config device set {container_name} eth0 limits.ingress {value}")
+            await execute_RTC(["RTC", "config", "device", "set", container_name, "eth0", "limits.egress", value])
+            await execute_RTC(["RTC", "config", "device", "set", container_name, "eth0", "limits.ingress", value])
             await ctx.send(embed=create_success_embed("Network Limited", f"Set RathamCloud network limit to {value} for `{container_name}`"))
         
         elif action.lower() in ["add", "remove"]:
@@ -2165,15 +2984,9 @@ async def vps_processes(ctx, container_name: str):
     await ctx.send(embed=create_info_embed("Gathering Processes", f"Listing processes in RathamCloud VPS `{container_name}`..."))
     
     try:
-        proc = await asyncio.create_subprocess_exec(
-            RTC_EXECUTABLE, "exec", container_name, "--", "ps", "aux",
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        stdout, stderr = await proc.communicate()
+        returncode, output = await rtc_shell_pool.run(container_name, ["ps", "aux"], limit=DIAGNOSTIC_OUTPUT_CAP)
         
-        if proc.returncode == 0:
-            output = stdout.decode()
+        if returncode == 0:
             # Split output if too long
             if len(output) > 1000:
                 output = output[:1000] + "\n... (truncated)"
@@ -2182,7 +2995,7 @@ async def vps_processes(ctx, container_name: str):
             add_field(embed, "Process List", f"```\n{output}\n```", False)
             await ctx.send(embed=embed)
         else:
-            await ctx.send(embed=create_error_embed("Error", f"Failed to list processes: {stderr.decode()}"))
+            await ctx.send(embed=create_error_embed("Error", f"Failed to list processes: {output}"))
     
     except Exception as e:
         await ctx.send(embed=create_error_embed("Process Listing Failed", f"Error: {str(e)}"))
@@ -2194,15 +3007,9 @@ async def vps_logs(ctx, container_name: str, lines: int = 50):
     await ctx.send(embed=create_info_embed("Gathering Logs", f"Fetching last {lines} lines from RathamCloud VPS `{container_name}`..."))
     
     try:
-        proc = await asyncio.create_subprocess_exec(
-            RTC_EXECUTABLE, "exec", container_name, "--", "journalctl", "-n", str(lines),
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        stdout, stderr = await proc.communicate()
+        returncode, output = await rtc_shell_pool.run(container_name, ["journalctl", "-n", str(lines), "--no-pager"], limit=DIAGNOSTIC_OUTPUT_CAP)
         
-        if proc.returncode == 0:
-            output = stdout.decode()
+        if returncode == 0:
             # Split output if too long
             if len(output) > 1000:
                 output = output[:1000] + "\n... (truncated)"
@@ -2211,7 +3018,7 @@ async def vps_logs(ctx, container_name: str, lines: int = 50):
             add_field(embed, "System Logs", f"```\n{output}\n```", False)
             await ctx.send(embed=embed)
         else:
-            await ctx.send(embed=create_error_embed("Error", f"Failed to fetch logs: {stderr.decode()}"))
+            await ctx.send(embed=create_error_embed("Error", f"Failed to fetch logs: {output}"))
     
     except Exception as e:
         await ctx.send(embed=create_error_embed("Log Retrieval Failed", f"Error: {str(e)}"))
@@ -2226,18 +3033,13 @@ async def setup_node(ctx, container_name: str, version: str = "20"):
     setup_cmd = f"curl -fsSL https://deb.nodesource.com/setup_{version}.x | sudo -E bash - && sudo apt-get install -y nodejs"
     
     try:
-        proc = await asyncio.create_subprocess_exec(
-            RTC_EXECUTABLE, "exec", container_name, "--", "bash", "-c", setup_cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        stdout, stderr = await proc.communicate()
+        returncode, stdout, stderr = await run_RTC(["RTC", "exec", container_name, "--", "bash", "-c", setup_cmd], timeout=600)
 
-        if proc.returncode == 0:
-            version_proc = await execute_RTC(f"RTC exec {container_name} -- node -v")
+        if returncode == 0:
+            version_proc = await execute_RTC(["RTC", "exec", container_name, "--", "node", "-v"])
             await ctx.send(embed=create_success_embed("Node.js Installed", f"Successfully installed Node.js in `{container_name}`\n**Version:** `{version_proc}`"))
         else:
-            error_output = stderr.decode().strip() or stdout.decode().strip()
+            error_output = stderr or stdout
             await ctx.send(embed=create_error_embed("Installation Failed", f"```\n{error_output[:1000]}\n```"))
             
     except Exception as e:
@@ -2249,17 +3051,15 @@ async def ports_command(ctx, action: str = "list", arg1: int = None, arg2: int =
     user_id = str(ctx.author.id)
     
     if action == "list":
-        active = port_data["active_ports"].get(user_id, [])
+        active = port_data["active_ports"].get(user_id, {})
         slots = port_data["users"].get(user_id, {}).get("slots", 0)
         
         embed = create_info_embed("🔌 Port Forwarding", f"Manage your port forwards. Available slots: **{len(active)}/{slots}**")
         if not active:
             add_field(embed, "Active Forwards", "No active port forwards.", False)
         else:
-            text = []
-            for p in active:
-                text.append(f"ID: `{p['host_port']}` | VPS: `{p['container']}` | `{p['host_port']}` → `{p['internal_port']}`")
-            add_field(embed, "Active Forwards", "\n".join(text), False)
+            text = "\n".join(f"ID: `{p['host_port']}` | VPS: `{p['container']}` | `{p['host_port']}` → `{p['internal_port']}`" for p in active.values())
+            add_field(embed, "Active Forwards", text, False)
         await ctx.send(embed=embed)
 
     elif action == "add":
@@ -2274,52 +3074,54 @@ async def ports_command(ctx, action: str = "list", arg1: int = None, arg2: int =
         container_name = vps["container_name"]
         
         slots = port_data["users"].get(user_id, {}).get("slots", 0)
-        active = port_data["active_ports"].get(user_id, [])
+        active = port_data["active_ports"].get(user_id, {})
         if len(active) >= slots:
             return await ctx.send(embed=create_error_embed("No Slots", "You have no available port slots. Contact an admin."))
         
-        host_port = get_next_available_port()
+        host_port = allocate_port()
         if not host_port:
             return await ctx.send(embed=create_error_embed("System Error", "No available ports on host."))
         
         await ctx.send(embed=create_info_embed("Adding Port Forward", f"Forwarding host port `{host_port}` to `{container_name}:{arg2}`..."))
         
         try:
-            await execute_RTC(f"RTC config device add {container_name} port-{host_port}-tcp proxy listen=tcp:0.0.0.0:{host_port} connect=tcp:127.0.0.1:{arg2}")
-            await execute_RTC(f"RTC config device add {container_name} port-{host_port}-udp proxy listen=udp:0.0.0.0:{host_port} connect=udp:127.0.0.1:{arg2}")
-            
-            if user_id not in port_data["active_ports"]:
-                port_data["active_ports"][user_id] = []
+            # The TCP and UDP devices are added one after the other: each device add rewrites the
+            # container's device list, so two concurrent adds could drop one of them
+            await execute_RTC(["RTC", "config", "device", "add", container_name, f"port-{host_port}-tcp", "proxy", f"listen=tcp:0.0.0.0:{host_port}", f"connect=tcp:127.0.0.1:{arg2}"])
+            try:
+                await execute_RTC(["RTC", "config", "device", "add", container_name, f"port-{host_port}-udp", "proxy", f"listen=udp:0.0.0.0:{host_port}", f"connect=udp:127.0.0.1:{arg2}"])
+            except Exception:
+                # Don't leave a TCP-only forward behind on a port that goes back to the pool
+                await run_RTC(["RTC", "config", "device", "remove", container_name, f"port-{host_port}-tcp"])
+                raise
             
-            port_data["active_ports"][user_id].append({
+            port_data["active_ports"].setdefault(user_id, {})[host_port] = {
                 "container": container_name,
                 "internal_port": arg2,
                 "host_port": host_port
-            })
-            save_data()
+            }
+            mark_dirty()
             await ctx.send(embed=create_success_embed("Port Forward Added", f"Successfully forwarded `{host_port}` (TCP/UDP) to `{container_name}:{arg2}`"))
         except Exception as e:
+            release_port(host_port)
             await ctx.send(embed=create_error_embed("Failed", str(e)))
 
     elif action == "remove":
         if arg1 is None:
             return await ctx.send(embed=create_error_embed("Usage", "Usage: `!ports remove <id>`"))
         
-        active = port_data["active_ports"].get(user_id, [])
-        found = None
-        for p in active:
-            if p["host_port"] == arg1:
-                found = p
-                break
+        active = port_data["active_ports"].get(user_id, {})
+        found = active.get(arg1)
         
         if not found:
             return await ctx.send(embed=create_error_embed("Not Found", "Port forward ID not found in your list."))
         
         try:
-            await execute_RTC(f"RTC config device remove {found['container']} port-{arg1}-tcp")
-            await execute_RTC(f"RTC config device remove {found['container']} port-{arg1}-udp")
-            active.remove(found)
-            save_data()
+            await execute_RTC(["RTC", "config", "device", "remove", found['container'], f"port-{arg1}-tcp"])
+            await execute_RTC(["RTC", "config", "device", "remove", found['container'], f"port-{arg1}-udp"])
+            del active[arg1]
+            release_port(arg1)
+            mark_dirty()
             await ctx.send(embed=create_success_embed("Port Forward Removed", f"Successfully removed port forward `{arg1}`"))
         except Exception as e:
             await ctx.send(embed=create_error_embed("Failed", str(e)))
@@ -2329,12 +3131,10 @@ async def ports_command(ctx, action: str = "list", arg1: int = None, arg2: int =
 async def ports_add_user(ctx, amount: int, user: discord.Member):
     """Allocate port slots to user (Admin only)"""
     user_id = str(user.id)
-    if user_id not in port_data["users"]:
-        port_data["users"][user_id] = {"slots": 0}
-    
-    port_data["users"][user_id]["slots"] += amount
-    save_data()
-    await ctx.send(embed=create_success_embed("Slots Allocated", f"Allocated {amount} port slots to {user.mention}. Total: {port_data['users'][user_id]['slots']}"))
+    user_ports = port_data["users"].setdefault(user_id, {"slots": 0})
+    user_ports["slots"] += amount
+    mark_dirty()
+    await ctx.send(embed=create_success_embed("Slots Allocated", f"Allocated {amount} port slots to {user.mention}. Total: {user_ports['slots']}"))
 
 @bot.command(name='setup-ssh')
 @is_admin()
@@ -2361,7 +3161,7 @@ echo "root:{password}" | chpasswd
 """
     try:
         # Execute the setup script inside the container using RTC exec
-        await execute_RTC(f"RTC exec {container_name} -- bash -c '{setup_script}'")
+        await execute_RTC(["RTC", "exec", container_name, "--", "bash", "-c", setup_script])
         embed = create_success_embed("SSH Setup Complete", f"SSH access enabled for `{container_name}`.")
         add_field(embed, "Credentials", f"**User:** `root`\\n**Password:** `{password}`", False)
         await ctx.send(embed=embed)
@@ -2401,68 +3201,59 @@ async def snap_status(ctx):
 @is_admin()
 async def suspend_vps(ctx, container_name: str, *, reason: str = "Admin action"):
     """Suspend a RathamCloud VPS (Admin only)"""
-    found = False
-    for uid, lst in vps_data.items():
-        for vps in lst:
-            if vps['container_name'] == container_name:
-                if vps.get('status') != 'running':
-                    await ctx.send(embed=create_error_embed("Cannot Suspend", "RathamCloud VPS must be running to suspend."))
-                    return
-                try:
-                    await execute_RTC(f"RTC stop {container_name}")
-                    vps['status'] = 'suspended'
-                    vps['suspended'] = True
-                    if 'suspension_history' not in vps:
-                        vps['suspension_history'] = []
-                    vps['suspension_history'].append({
-                        'time': datetime.now().isoformat(),
-                        'reason': reason,
-                        'by': f"{ctx.author.name} ({ctx.author.id})"
-                    })
-                    save_data()
-                except Exception as e:
-                    await ctx.send(embed=create_error_embed("Suspend Failed", str(e)))
-                    return
-                # DM owner
-                try:
-                    owner = await bot.fetch_user(int(uid))
-                    embed = create_warning_embed("🚨 RathamCloud VPS Suspended", f"Your VPS `{container_name}` has been suspended by an admin.\n\n**Reason:** {reason}\n\nContact a RathamCloud admin to unsuspend.")
-                    await owner.send(embed=embed)
-                except Exception as dm_e:
-                    logger.error(f"Failed to DM owner {uid}: {dm_e}")
-                await ctx.send(embed=create_success_embed("VPS Suspended", f"RathamCloud VPS `{container_name}` suspended. Reason: {reason}"))
-                found = True
-                break
-        if found:
-            break
-    if not found:
+    entry = container_index.get(container_name)
+    if not entry:
         await ctx.send(embed=create_error_embed("Not Found", f"RathamCloud VPS `{container_name}` not found."))
+        return
+    uid, vps = entry
+    if vps.get('status') != 'running':
+        await ctx.send(embed=create_error_embed("Cannot Suspend", "RathamCloud VPS must be running to suspend."))
+        return
+    try:
+        await execute_RTC(["RTC", "stop", container_name])
+        set_vps_state(vps, status='suspended', suspended=True)
+        if 'suspension_history' not in vps:
+            vps['suspension_history'] = []
+        vps['suspension_history'].append({
+            'time': datetime.now().isoformat(),
+            'reason': reason,
+            'by': f"{ctx.author.name} ({ctx.author.id})"
+        })
+        mark_dirty()
+    except Exception as e:
+        await ctx.send(embed=create_error_embed("Suspend Failed", str(e)))
+        return
+    # DM owner in the background so the confirmation does not wait on Discord's DM endpoint
+    spawn_background(notify_suspended(uid, container_name, reason))
+    await ctx.send(embed=create_success_embed("VPS Suspended", f"RathamCloud VPS `{container_name}` suspended. Reason: {reason}"))
 
 @bot.command(name='unsuspend-vps')
 @is_admin()
 async def unsuspend_vps(ctx, container_name: str):
     """Unsuspend a RathamCloud VPS (Admin only)"""
-    found = False
-    for uid, lst in vps_data.items():
-        for vps in lst:
-            if vps['container_name'] == container_name:
-                if not vps.get('suspended', False):
-                    await ctx.send(embed=create_error_embed("Not Suspended", "RathamCloud VPS is not suspended."))
-                    return
-                try:
-                    vps['suspended'] = False
-                    vps['status'] = 'running'
-                    await execute_RTC(f"RTC start {container_name}")
-                    save_data()
-                    await ctx.send(embed=create_success_embed("VPS Unsuspended", f"RathamCloud VPS `{container_name}` unsuspended and started."))
-                    found = True
-                except Exception as e:
-                    await ctx.send(embed=create_error_embed("Start Failed", str(e)))
-                break
-        if found:
-            break
-    if not found:
+    entry = container_index.get(container_name)
+    if not entry:
         await ctx.send(embed=create_error_embed("Not Found", f"RathamCloud VPS `{container_name}` not found."))
+        return
+    vps = entry[1]
+    if not vps.get('suspended', False):
+        await ctx.send(embed=create_error_embed("Not Suspended", "RathamCloud VPS is not suspended."))
+        return
+    try:
+        set_vps_state(vps, status='running', suspended=False)
+        await execute_RTC(["RTC", "start", container_name])
+        mark_dirty()
+        await ctx.send(embed=create_success_embed("VPS Unsuspended", f"RathamCloud VPS `{container_name}` unsuspended and started."))
+    except Exception as e:
+        await ctx.send(embed=create_error_embed("Start Failed", str(e)))
+
+# Most recent events shown by the global suspension-logs view
+SUSPENSION_LOG_LIMIT = 50
+
+@functools.lru_cache(maxsize=4096)
+def format_event_time(iso_time, fmt='%Y-%m-%d %H:%M:%S'):
+    """Render a stored ISO timestamp for display, memoized since history entries never change"""
+    return datetime.fromisoformat(iso_time).strftime(fmt)
 
 @bot.command(name='suspension-logs')
 @is_admin()
@@ -2470,14 +3261,7 @@ async def suspension_logs(ctx, container_name: str = None):
     """View RathamCloud suspension logs (Admin only)"""
     if container_name:
         # Specific VPS
-        found = None
-        for lst in vps_data.values():
-            for vps in lst:
-                if vps['container_name'] == container_name:
-                    found = vps
-                    break
-            if found:
-                break
+        _, found = container_index.get(container_name, (None, None))
         if not found:
             await ctx.send(embed=create_error_embed("Not Found", f"RathamCloud VPS `{container_name}` not found."))
             return
@@ -2486,67 +3270,39 @@ async def suspension_logs(ctx, container_name: str = None):
             await ctx.send(embed=create_info_embed("No Suspensions", f"No RathamCloud suspension history for `{container_name}`."))
             return
         embed = create_embed("RathamCloud Suspension History", f"For `{container_name}`")
-        text = []
-        for h in sorted(history, key=lambda x: x['time'], reverse=True)[:10]:  # Last 10
-            t = datetime.fromisoformat(h['time']).strftime('%Y-%m-%d %H:%M:%S')
-            text.append(f"**{t}** - {h['reason']} (by {h['by']})")
-        add_field(embed, "History", "\n".join(text), False)
+        recent = heapq.nlargest(10, history, key=lambda x: x['time'])  # Last 10
+        text = "\n".join(f"**{format_event_time(h['time'])}** - {h['reason']} (by {h['by']})" for h in recent)
+        add_field(embed, "History", text, False)
         if len(history) > 10:
             add_field(embed, "Note", "Showing last 10 entries.")
         await ctx.send(embed=embed)
     else:
-        # All logs
-        all_logs = []
-        for uid, lst in vps_data.items():
-            for vps in lst:
-                h = vps.get('suspension_history', [])
-                for event in sorted(h, key=lambda x: x['time'], reverse=True):
-                    t = datetime.fromisoformat(event['time']).strftime('%Y-%m-%d %H:%M')
-                    all_logs.append(f"**{t}** - VPS `{vps['container_name']}` (Owner: <@{uid}>) - {event['reason']} (by {event['by']})")
+        # All logs: the most recent events across every VPS, picked in one pass without sorting each history
+        events = ((event, vps['container_name'], uid) for uid, vps in container_index.values() for event in vps.get('suspension_history', []))
+        all_logs = [
+            f"**{format_event_time(event['time'], '%Y-%m-%d %H:%M')}** - VPS `{name}` (Owner: <@{uid}>) - {event['reason']} (by {event['by']})"
+            for event, name, uid in heapq.nlargest(SUSPENSION_LOG_LIMIT, events, key=lambda e: e[0]['time'])
+        ]
         if not all_logs:
             await ctx.send(embed=create_info_embed("No Suspensions", "No RathamCloud suspension events recorded."))
             return
         # Split into embeds
+        embeds = []
         for i in range(0, len(all_logs), 10):
             chunk = all_logs[i:i+10]
-            embed = create_embed(f"RathamCloud Suspension Logs ({i+1}-{min(i+10, len(all_logs))})", f"Global suspension events (newest first)")
+            embed = create_embed(f"RathamCloud Suspension Logs ({i+1}-{min(i+10, len(all_logs))})", f"Global suspension events (newest first, up to {SUSPENSION_LOG_LIMIT})")
             add_field(embed, "Events", "\n".join(chunk), False)
-            await ctx.send(embed=embed)
-
-class HelpView(discord.ui.View):
-    def __init__(self, author, is_admin, is_main_admin):
-        super().__init__(timeout=180)
-        self.author = author
-        
-        options = [
-            discord.SelectOption(label="User Commands", description="Basic commands for all users", emoji="👤", value="user")
-        ]
-        if is_admin:
-            options.append(discord.SelectOption(label="Admin Commands", description="VPS management for staff", emoji="🛡️", value="admin"))
-        if is_main_admin:
-            options.append(discord.SelectOption(label="Main Admin Commands", description="Bot ownership commands", emoji="👑", value="main"))
-            
-        self.select = discord.ui.Select(placeholder="Select a command category...", options=options)
-        self.select.callback = self.select_callback
-        self.add_item(self.select)
+            embeds.append(embed)
+        await send_embeds(ctx, embeds)
 
-    async def select_callback(self, interaction: discord.Interaction):
-        if interaction.user.id != self.author.id:
-            return await interaction.response.send_message("This menu is only for the person who used the command.", ephemeral=True)
-            
-        selection = self.select.values[0]
-        if selection == "user":
-            embed = self.get_user_embed()
-        elif selection == "admin":
-            embed = self.get_admin_embed()
-        else:
-            embed = self.get_main_admin_embed()
-            
-        await interaction.response.edit_message(embed=embed, view=self)
+def help_text(cmds):
+    return "\n".join(f"**{cmd}** - {desc}" for cmd, desc in cmds)
 
-    def get_user_embed(self):
-        embed = create_embed("Command Help", "Select a category from the menu to see available commands.", 0x1a1a1a)
-        user_cmds = [
+# Help pages: {category: (title, description, [(field name, field text)])}, joined once at import
+# The embeds themselves are still built per use so the footer timestamp stays current
+HELP_PAGES = {
+    "user": ("Command Help", "Select a category from the menu to see available commands.", [
+        ("👤 User Commands", help_text([
             ("!ping", "Check bot latency"),
             ("!uptime", "Show host uptime"),
             ("!myvps", "List your RathamCloud VPS"),
@@ -2555,24 +3311,18 @@ class HelpView(discord.ui.View):
             ("!share-ruser @user <num>", "Revoke VPS access"),
             ("!manage-shared @owner <num>", "Manage shared VPS"),
             ("!ports [add|list|remove]", "Manage port forwards")
-        ]
-        cmd_text = "\n".join([f"**{cmd}** - {desc}" for cmd, desc in user_cmds])
-        add_field(embed, "👤 User Commands", cmd_text, False)
-        return embed
-
-    def get_admin_embed(self):
-        embed = create_embed("Admin Help", "Advanced VPS management commands.", 0x1a1a1a)
-        
-        mgmt_cmds = [
+        ])),
+    ]),
+    "admin": ("Admin Help", "Advanced VPS management commands.", [
+        ("🛡️ Management", help_text([
             ("!create <ram> <cpu> <disk> @user [os]", "Deploy new VPS"),
             ("!delete-vps @user <num>", "Remove a user's VPS"),
             ("!suspend-vps <id>", "Suspend a VPS"),
             ("!unsuspend-vps <id>", "Unsuspend a VPS"),
             ("!resize-vps <id> [specs]", "Change VPS resources"),
             ("!clone-vps <id>", "Clone an existing VPS")
-        ]
-        
-        sys_cmds = [
+        ])),
+        ("⚙️ System Tools", help_text([
             ("!RTC-list", "List all containers"),
             ("!serverstats", "Global resource overview"),
             ("!vpsinfo [id]", "Detailed VPS data"),
@@ -2581,34 +3331,57 @@ class HelpView(discord.ui.View):
             ("!stop-vps-all", "Emergency stop all VPS"),
             ("!snap-status", "Check host snap status"),
             ("!node", "Node setup instructions")
-        ]
-        
-        add_field(embed, "🛡️ Management", "\n".join([f"**{c}** - {d}" for c, d in mgmt_cmds]), False)
-        add_field(embed, "⚙️ System Tools", "\n".join([f"**{c}** - {d}" for c, d in sys_cmds]), False)
-        return embed
-
-    def get_main_admin_embed(self):
-        embed = create_embed("Main Admin Help", "Bot configuration and ownership.", 0x1a1a1a)
-        main_cmds = [
+        ])),
+    ]),
+    "main": ("Main Admin Help", "Bot configuration and ownership.", [
+        ("👑 Ownership Commands", help_text([
             ("!admin-add @user", "Promote to admin"),
             ("!admin-remove @user", "Demote from admin"),
             ("!admin-list", "View admin team"),
             ("!sync [guild_id]", "Sync slash commands")
+        ])),
+    ]),
+}
+
+def help_embed(category):
+    title, description, fields = HELP_PAGES[category]
+    embed = create_embed(title, description, 0x1a1a1a)
+    add_fields(embed, [(name, text, False) for name, text in fields])
+    return embed
+
+class HelpView(discord.ui.View):
+    def __init__(self, author, is_admin, is_main_admin):
+        super().__init__(timeout=180)
+        self.author = author
+        
+        options = [
+            discord.SelectOption(label="User Commands", description="Basic commands for all users", emoji="👤", value="user")
         ]
-        cmd_text = "\n".join([f"**{cmd}** - {desc}" for cmd, desc in main_cmds])
-        add_field(embed, "👑 Ownership Commands", cmd_text, False)
-        return embed
+        if is_admin:
+            options.append(discord.SelectOption(label="Admin Commands", description="VPS management for staff", emoji="🛡️", value="admin"))
+        if is_main_admin:
+            options.append(discord.SelectOption(label="Main Admin Commands", description="Bot ownership commands", emoji="👑", value="main"))
+            
+        self.select = discord.ui.Select(placeholder="Select a command category...", options=options)
+        self.select.callback = self.select_callback
+        self.add_item(self.select)
+
+    async def select_callback(self, interaction: discord.Interaction):
+        if interaction.user.id != self.author.id:
+            return await interaction.response.send_message("This menu is only for the person who used the command.", ephemeral=True)
+            
+        embed = help_embed(self.select.values[0])
+        await interaction.response.edit_message(embed=embed, view=self)
 
 @bot.command(name='help')
 async def show_help(ctx):
     """Show RathamCloud help information with a menu"""
     user_id = str(ctx.author.id)
-    is_user_admin = user_id == str(MAIN_ADMIN_ID) or user_id in admin_data.get("admins", [])
-    is_user_main_admin = user_id == str(MAIN_ADMIN_ID)
+    is_user_admin = user_id in admin_ids
+    is_user_main_admin = user_id == MAIN_ADMIN_STR
 
     view = HelpView(ctx.author, is_user_admin, is_user_main_admin)
-    embed = view.get_user_embed()
-    await ctx.send(embed=embed, view=view)
+    await ctx.send(embed=help_embed("user"), view=view)
 
 # Command aliases for typos
 @bot.command(name='mangage')
@@ -2619,7 +3392,7 @@ async def manage_typo(ctx):
 @bot.command(name='stats')
 async def stats_alias(ctx):
     """Alias for serverstats command"""
-    if str(ctx.author.id) == str(MAIN_ADMIN_ID) or str(ctx.author.id) in admin_data.get("admins", []):
+    if str(ctx.author.id) in admin_ids:
         await server_stats(ctx)
     else:
         await ctx.send(embed=create_error_embed("Access Denied", "This RathamCloud command requires admin privileges."))
@@ -2627,7 +3400,7 @@ async def stats_alias(ctx):
 @bot.command(name='info')
 async def info_alias(ctx):
     """Alias for userinfo command"""
-    if str(ctx.author.id) == str(MAIN_ADMIN_ID) or str(ctx.author.id) in admin_data.get("admins", []):
+    if str(ctx.author.id) in admin_ids:
         await ctx.send(embed=create_error_embed("Usage", "Please specify a user: `!info @user`"))
     else:
         await ctx.send(embed=create_error_embed("Access Denied", "This RathamCloud command requires admin privileges."))
@@ -2635,6 +3408,16 @@ async def info_alias(ctx):
 # Run the bot with your token
 if __name__ == "__main__":
     if DISCORD_TOKEN:
-        bot.run(DISCORD_TOKEN)
+        if uvloop is not None:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+            logger.info("Using uvloop event loop")
+        signal.signal(signal.SIGTERM, handle_sigterm)
+        try:
+            bot.run(DISCORD_TOKEN)
+        finally:
+            rtc_shell_pool.close_all()
+            # Flush anything still waiting on the debounce window
+            if save_pending.is_set():
+                save_data(durable=True)
     else:
         logger.error("No Discord token found in DISCORD_TOKEN environment variable.")